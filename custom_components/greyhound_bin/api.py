@@ -1,19 +1,42 @@
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime
 import html
+from http import HTTPStatus
 import json
 import logging
 import re
 import socket
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
+
+from aiohttp import ClientError, ClientResponse, ClientSession, hdrs
+from bs4 import BeautifulSoup
+from yarl import URL
+
+from .const import (
+    CALENDAR_URL,
+    EVENT_HORIZON_DAYS,
+    LOGIN_URL,
+    NO_DISRUPTION,
+    NOTICES_URL,
+    REQUEST_CALENDAR,
+    REQUEST_LOGIN_PAGE,
+    REQUEST_LOGIN_POST,
+    REQUEST_NOTICES,
+)
+from .schedule import Schedule, ScheduleCache
+from .timeouts import AdaptiveTimeouts
+from .tracing import SPAN_KIND_CLIENT, span
 
-from aiohttp import ClientError, ClientResponse, ClientSession
-import async_timeout
-from bs4 import BeautifulSoup, Tag
+_LOGGER = logging.getLogger(__name__)
 
-from .const import BIN_DESCRIPTIONS, BIN_ORDER, CALENDAR_URL, LOGIN_URL
+# Longest string Home Assistant accepts as an entity state
+MAX_STATE_LENGTH = 255
+NOTICE_CLASS_PATTERN = re.compile(r"\b(alert|notice|notification)\b")
 
-_LOGGER = logging.getLogger(__name__)
+CSRF_COOKIE = "csrftoken"
+SESSION_COOKIE = "sessionid"
+CSRF_INPUT_PATTERN = re.compile(r"<input\b[^>]*\bcsrfmiddlewaretoken\b[^>]*>", re.I)
+CSRF_VALUE_PATTERN = re.compile(r"\bvalue=[\"']([^\"']+)[\"']", re.I)
 
 
 class GreyhoundAPIError(Exception):
@@ -24,15 +47,40 @@ class GreyhoundAPICommunicationError(GreyhoundAPIError):
     """Communication error with the API."""
 
 
+class GreyhoundAPIAuthError(GreyhoundAPIError):
+    """The portal rejected the account number or PIN."""
+
+
+class GreyhoundNoticesUnavailable(GreyhoundAPIError):
+    """The portal does not serve a notices page at NOTICES_URL."""
+
+
 class GreyhoundApiClient:
     """Client to interact with the Greyhound bin collection API."""
 
-    def __init__(self, accountnumber: str, pin: str, session: ClientSession) -> None:
+    def __init__(
+        self,
+        accountnumber: str,
+        pin: str,
+        session: ClientSession,
+        schedule_cache: ScheduleCache | None = None,
+        timeouts: AdaptiveTimeouts | None = None,
+        notices: bool = False,
+    ) -> None:
         """Initialize the client."""
         self.accountnumber = accountnumber
         self.pin = pin
         self._session = session
+        self._schedule_cache = schedule_cache or ScheduleCache(max_size=1)
+        self._timeouts = timeouts or AdaptiveTimeouts()
         self.logged_in = False
+        # Plain counters, read by the metrics view when scraped
+        self.logins = 0
+        self.bytes_received = 0
+        # Opt-in, NOTICES_URL is not a documented endpoint
+        self.notices_enabled = notices
+        # Last notices fetched, kept when a later notices fetch fails
+        self._notices: tuple[str, ...] | None = None
 
     async def _api_wrapper(
         self,
@@ -41,21 +89,35 @@ class GreyhoundApiClient:
         data: Optional[Dict] = None,
         headers: Optional[Dict] = None,
         return_json: bool = True,
+        request: str = REQUEST_CALENDAR,
+        span_name: str = "http",
     ) -> Any:
         """Generic API request wrapper."""
         try:
-            async with async_timeout.timeout(10):
-                async with self._session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=data,
-                ) as response:
-                    self._verify_response_or_raise(response)
-
-                    if return_json:
-                        return await response.json()
-                    return await response.text()
+            with span(
+                span_name,
+                SPAN_KIND_CLIENT,
+                **{"http.request.method": method, "url.full": url},
+            ) as request_span:
+                with self._timeouts.measure(url, request) as timeout:
+                    async with self._session.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        json=data,
+                        timeout=timeout,
+                    ) as response:
+                        request_span.set_attribute(
+                            "http.response.status_code", response.status
+                        )
+                        self._verify_response_or_raise(response)
+                        body = await response.read()
+                        self.bytes_received += len(body)
+                        request_span.set_attribute("http.response.body.size", len(body))
+
+                        if return_json:
+                            return await response.json()
+                        return await response.text()
 
         except asyncio.TimeoutError as exception:
             msg = f"Timeout error fetching information - {exception}"
@@ -73,134 +135,261 @@ class GreyhoundApiClient:
         if response.status >= 400:
             raise GreyhoundAPIError(f"HTTP error: {response.status}")
 
-    async def login(self) -> None:
-        """Perform login to the Greyhound API."""
-        try:
-            text = await self._api_wrapper("GET", LOGIN_URL, return_json=False)
-            soup = BeautifulSoup(text, "html.parser")
-            token_input = soup.find("input", {"name": "csrfmiddlewaretoken"})
-
-            if not token_input or not isinstance(token_input, Tag):
-                raise GreyhoundAPIError("CSRF token input not found or not a Tag")
-
-            csrf_token = token_input.get("value")
-
-            if not csrf_token:
-                raise GreyhoundAPIError("CSRF token missing 'value' attribute")
+    def _cookie_csrf_token(self) -> str | None:
+        """Return the CSRF token Django left in the session's cookie jar."""
+        cookie = self._session.cookie_jar.filter_cookies(URL(LOGIN_URL)).get(
+            CSRF_COOKIE
+        )
+        return cookie.value if cookie else None
+
+    async def _async_page_csrf_token(self) -> str:
+        """Fetch the login page and extract the form's CSRF token."""
+        text = await self._api_wrapper(
+            "GET",
+            LOGIN_URL,
+            return_json=False,
+            request=REQUEST_LOGIN_PAGE,
+            span_name="login.page",
+        )
+        with span("login.csrf"):
+            # The page also sets the cookie, which is the cheaper source
+            if token := self._cookie_csrf_token() or extract_csrf_token(text):
+                return token
+        raise GreyhoundAPIError("CSRF token not found on the login page")
+
+    async def _async_post_login(self, csrf_token: str) -> tuple[int, bool]:
+        """Post the credentials, return the status and whether a session began."""
+        with span(
+            "login.post",
+            SPAN_KIND_CLIENT,
+            **{"http.request.method": "POST", "url.full": LOGIN_URL},
+        ) as post_span:
+            with self._timeouts.measure(LOGIN_URL, REQUEST_LOGIN_POST) as timeout:
+                async with self._session.post(
+                    LOGIN_URL,
+                    data={
+                        "csrfmiddlewaretoken": csrf_token,
+                        "customerNo": self.accountnumber,
+                        "pinCode": self.pin,
+                    },
+                    headers={"Referer": LOGIN_URL, "User-Agent": "Mozilla/5.0"},
+                    allow_redirects=False,
+                    timeout=timeout,
+                ) as login_resp:
+                    body = await login_resp.read()
+                    new_session = SESSION_COOKIE in login_resp.cookies
+            self.bytes_received += len(body)
+            post_span.set_attribute("http.response.status_code", login_resp.status)
+            post_span.set_attribute("http.response.body.size", len(body))
+        return login_resp.status, new_session
 
-            csrf_token = token_input["value"]
-
-            login_data = {
-                "csrfmiddlewaretoken": csrf_token,
-                "customerNo": self.accountnumber,
-                "pinCode": self.pin,
-            }
-
-            headers = {
-                "Referer": LOGIN_URL,
-                "User-Agent": "Mozilla/5.0",
-                "Content-Type": "application/x-www-form-urlencoded",
-            }
-
-            login_resp = await self._session.post(
-                LOGIN_URL, data=login_data, headers=headers
-            )
+    async def login(self) -> None:
+        """Perform login to the Greyhound API.
 
-            login_text = await login_resp.text()
+        Reuses the csrftoken cookie from an earlier visit so a re-login is a
+        single POST; the login page is only fetched when the cookie is
+        missing or the portal rejects it.
+        """
+        self.logins += 1
+        try:
+            result = None
+            if token := self._cookie_csrf_token():
+                result = await self._async_post_login(token)
+            if result is None or result[0] == HTTPStatus.FORBIDDEN:
+                # No cookie yet, or Django rejected a stale token
+                result = await self._async_post_login(
+                    await self._async_page_csrf_token()
+                )
 
-            if "Dashboard" not in login_text and "Logout" not in login_text:
-                _LOGGER.error("Login failed. 'Logout' not found in response body.")
-                raise GreyhoundAPIError(
+            if result[0] >= HTTPStatus.BAD_REQUEST:
+                # An outage or rate limit is not a rejected PIN
+                raise GreyhoundAPIError(f"Login failed with HTTP status {result[0]}")
+            if not login_succeeded(*result):
+                _LOGGER.error("Login failed with status %s", result[0])
+                raise GreyhoundAPIAuthError(
                     "Login failed: Possibly invalid credentials or unexpected response."
                 )
 
             _LOGGER.debug("Login successful for user %s", self.accountnumber)
             self.logged_in = True
 
-        except ClientError as err:
+        except (ClientError, asyncio.TimeoutError) as err:
             _LOGGER.exception("HTTP error during login: %s", err)
             raise GreyhoundAPIError("HTTP error during login.") from err
         except Exception as err:
             _LOGGER.exception("Unexpected error during login: %s", err)
             raise
 
+    async def async_get_payload(self) -> str:
+        """Log in if needed and return the raw embedded calendar payload."""
+        if not self.logged_in:
+            await self.login()
+        return await self._async_get_calendar_payload()
+
+    async def _async_get_calendar_payload(self) -> str:
+        """Return the raw embedded calendar payload."""
+        calendar_text = await self._api_wrapper(
+            "GET",
+            CALENDAR_URL,
+            return_json=False,
+            request=REQUEST_CALENDAR,
+            span_name="calendar.get",
+        )
+
+        # Extract embedded JS data with regex
+        with span("calendar.extract") as extract_span:
+            match = re.search(r'var data = "(.*?)getJSONData', calendar_text, re.DOTALL)
+            if not match:
+                raise GreyhoundAPIError("Could not find embedded calendar data.")
+            extract_span.set_attribute("payload.size", len(match.group(1)))
+
+        return match.group(1)
+
+    async def _async_get_notices(self) -> tuple[str, ...]:
+        """Return the portal's current service notices.
+
+        Redirects are not followed: the portal sends logged-out and unknown
+        pages to the login form, whose markup must not be read as notices.
+        """
+        with span(
+            "notices.get",
+            SPAN_KIND_CLIENT,
+            **{"http.request.method": "GET", "url.full": NOTICES_URL},
+        ) as get_span:
+            with self._timeouts.measure(NOTICES_URL, REQUEST_NOTICES) as timeout:
+                async with self._session.get(
+                    NOTICES_URL, allow_redirects=False, timeout=timeout
+                ) as response:
+                    text = await response.text()
+            self.bytes_received += len(text)
+            get_span.set_attribute("http.response.status_code", response.status)
+            get_span.set_attribute("http.response.body.size", len(text))
+
+        if response.status != HTTPStatus.OK or response.url != URL(NOTICES_URL):
+            raise GreyhoundNoticesUnavailable(
+                f"{NOTICES_URL} answered {response.status} "
+                f"{response.headers.get(hdrs.LOCATION, '')}".rstrip()
+            )
+        with span("notices.parse") as parse_span:
+            notices = parse_notices(text)
+            parse_span.set_attribute("notices.count", len(notices))
+        return notices
+
     async def async_get_data(self) -> dict[str, Any]:
         """Fetch bin collection events for the next 30 days."""
         if not self.logged_in:
             await self.login()
 
-        calendar_text = await self._api_wrapper("GET", CALENDAR_URL, return_json=False)
+        # Both pages share the logged-in session, fetch them side by side
+        payload, notices = await asyncio.gather(
+            self._async_get_calendar_payload(),
+            self._async_get_notices() if self.notices_enabled else _no_notices(),
+            return_exceptions=True,
+        )
+        if isinstance(payload, BaseException):
+            # The session may have expired, log in again on the next refresh
+            self.logged_in = False
+            raise payload
+        if isinstance(notices, GreyhoundNoticesUnavailable):
+            # Not a transient failure, stop asking instead of warning each time
+            _LOGGER.warning("Service notices disabled: %s", notices)
+            self.notices_enabled = False
+        elif isinstance(notices, BaseException):
+            # Notices are optional, keep the last known ones
+            _LOGGER.warning("Could not fetch service notices: %s", notices)
+        elif notices is not None:
+            self._notices = notices
+
+        # Accounts on the same route share byte-identical payloads
+        with span("schedule.decode") as decode_span:
+            hits = self._schedule_cache.hits
+            schedule = self._schedule_cache.get_or_parse(
+                payload, parse_schedule_payload
+            )
+            decode_span.set_attribute("cache.hit", self._schedule_cache.hits > hits)
+            decode_span.set_attribute("schedule.events", len(schedule.events))
 
-        # Extract embedded JS data with regex
-        match = re.search(r'var data = "(.*?)getJSONData', calendar_text, re.DOTALL)
-        if not match:
-            raise GreyhoundAPIError("Could not find embedded calendar data.")
+        # Filter events within next 30 days
+        with span("schedule.summary") as summary_span:
+            events, summary = schedule.view(datetime.now().date(), EVENT_HORIZON_DAYS)
+            summary_span.set_attribute("events", len(events))
 
-        raw_data_str = match.group(1)
-        unescaped = html.unescape(raw_data_str)
+        _LOGGER.info("Fetched %d bin collection events", len(events))
 
-        json_match = re.search(r'({.*?})"', unescaped, re.DOTALL)
-        if not json_match:
-            raise GreyhoundAPIError("Failed to extract JSON payload.")
+        return {
+            "events": events,  # calendar uses this
+            "sensors": with_disruption(summary, self._notices),  # sensors use this
+            "schedule": schedule,  # full parsed schedule for diffs
+            "notices": self._notices or (),
+        }
 
-        try:
-            raw_json = json.loads(json_match.group(1))
-            collection_days = raw_json["data"]["collection_days"]
-        except (json.JSONDecodeError, KeyError) as err:
-            _LOGGER.exception("JSON parsing failed.")
-            raise GreyhoundAPIError("Invalid calendar data format.") from err
 
-        # Filter events within next 30 days
-        today = datetime.now().date()
-        cutoff = today + timedelta(days=30)
-        events = []
-
-        for date_str, bins in collection_days.items():
-            try:
-                event_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-            except ValueError:
-                _LOGGER.warning("Skipping invalid date format: %s", date_str)
-                continue
-
-            if today <= event_date <= cutoff:
-                waste_types = [
-                    b["waste_types"][0] for b in bins if b.get("waste_types")
-                ]
-                events.append(
-                    {
-                        "date": event_date,
-                        "bins": waste_types,
-                    }
-                )
+async def _no_notices() -> None:
+    """Stand in for the notices fetch when it is disabled."""
 
-        _LOGGER.info("Fetched %d bin collection events", len(events))
 
-        # Build summary sensor data
-        summary: dict[str, Any] = {}
-        if events:
-            next_event = events[0]  # assume sorted by date
-            days_until = (next_event["date"] - today).days
+def with_disruption(
+    summary: Mapping[str, Any], notices: tuple[str, ...] | None
+) -> dict[str, Any]:
+    """Return the sensor summary with the service disruption field added.
 
-            ordered_bins = sorted(
-                next_event["bins"], key=lambda b: BIN_ORDER.get(b, 999)
-            )
+    The field is left out until notices have been fetched once, so the
+    disruption sensor is not created for accounts that never get them.
+    """
+    if notices is None:
+        return dict(summary)
+    disruption = notices[0][:MAX_STATE_LENGTH] if notices else NO_DISRUPTION
+    return {**summary, "service_disruption": disruption}
 
-            summary = {
-                "next_collection_date": next_event["date"].isoformat(),
-                "bin_types": ", ".join(ordered_bins),
-                "bin_types_friendly": ", ".join(
-                    BIN_DESCRIPTIONS[bin_type] for bin_type in ordered_bins
-                ),
-                "days_until_collection": days_until,
-                "collection_status": (
-                    "Today"
-                    if days_until == 0
-                    else "Tomorrow" if days_until == 1 else f"In {days_until} days"
-                ),
-                # "service_disruption": next_event["cancelled"],
-            }
 
-        return {
-            "events": events,  # calendar uses this
-            "sensors": summary,  # sensors use this
-        }
+def login_succeeded(status: int, new_session: bool) -> bool:
+    """Return True if a login POST logged in.
+
+    Django answers a successful login with a redirect, wherever it points
+    (the landing page may be the login URL itself), and sets a new session
+    cookie. Rejected credentials render the form again with a 200, so the
+    body never needs to be searched.
+    """
+    return new_session or (
+        HTTPStatus.MULTIPLE_CHOICES <= status < HTTPStatus.BAD_REQUEST
+    )
+
+
+def extract_csrf_token(text: str) -> str | None:
+    """Return the login form's CSRF token without parsing the whole page."""
+    if (tag := CSRF_INPUT_PATTERN.search(text)) and (
+        value := CSRF_VALUE_PATTERN.search(tag.group(0))
+    ):
+        return value.group(1)
+    return None
+
+
+def parse_notices(text: str) -> tuple[str, ...]:
+    """Extract the text of service notices from the notices page."""
+    soup = BeautifulSoup(text, "html.parser")
+    notices = []
+    for element in soup.find_all(class_=NOTICE_CLASS_PATTERN):
+        if element.find_parent(class_=NOTICE_CLASS_PATTERN):
+            continue  # Already part of an enclosing notice
+        notice = " ".join(element.get_text(" ", strip=True).split())
+        if notice and notice not in notices:
+            notices.append(notice)
+    return tuple(notices)
+
+
+def parse_schedule_payload(raw_data_str: str) -> Schedule:
+    """Decode the embedded calendar payload into a schedule."""
+    unescaped = html.unescape(raw_data_str)
+
+    json_match = re.search(r'({.*?})"', unescaped, re.DOTALL)
+    if not json_match:
+        raise GreyhoundAPIError("Failed to extract JSON payload.")
+
+    try:
+        raw_json = json.loads(json_match.group(1))
+        collection_days = raw_json["data"]["collection_days"]
+    except (json.JSONDecodeError, KeyError) as err:
+        _LOGGER.exception("JSON parsing failed.")
+        raise GreyhoundAPIError("Invalid calendar data format.") from err
+
+    return Schedule.from_collection_days(collection_days)
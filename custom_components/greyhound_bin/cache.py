@@ -0,0 +1,381 @@
+"""Integration-wide memory budget for the parsed data of every account."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+import json
+import sys
+import time
+from types import MappingProxyType
+from typing import Any
+
+from .const import LOGGER
+from .schedule import (
+    CollectionEvent,
+    Schedule,
+    ScheduleCache,
+    compact_events,
+    expand_events,
+)
+
+EVICT_SIZE = "size"
+EVICT_TTL = "ttl"
+
+
+def approximate_size(value: Any, seen: set[int] | None = None) -> int:
+    """Return the bytes held by value and the containers it owns.
+
+    Collection events are interned and shared between accounts, so only the
+    references to them are counted.
+    """
+    if seen is None:
+        seen = set()
+    if id(value) in seen or isinstance(value, CollectionEvent):
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, (dict, MappingProxyType)):
+        size += sum(
+            approximate_size(key, seen) + approximate_size(item, seen)
+            for key, item in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, seen) for item in value)
+    elif isinstance(value, Schedule):
+        size += sum(
+            approximate_size(getattr(value, name), seen)
+            for name in Schedule.__slots__
+            if name != "__weakref__"
+        )
+    return size
+
+
+def summary_to_compact(summary: Mapping[str, Any]) -> dict[str, Any]:
+    """Return an account's data but its schedule as JSON-friendly values."""
+    return {
+        "events": compact_events(summary["events"]),
+        "predicted": compact_events(summary.get("predicted", ())),
+        "sensors": dict(summary["sensors"]),
+        "notices": list(summary.get("notices", ())),
+    }
+
+
+def summary_from_compact(compact: Mapping[str, Any]) -> dict[str, Any]:
+    """Rebuild what summary_to_compact returned."""
+    return {
+        "events": expand_events(compact["events"]),
+        "sensors": dict(compact["sensors"]),
+        "notices": tuple(compact["notices"]),
+        "predicted": expand_events(compact["predicted"]),
+    }
+
+
+def encode_schedule(schedule: Schedule) -> bytes:
+    """Return a schedule's events as UTF-8 JSON [date, bins] pairs."""
+    return json.dumps(compact_events(schedule.events), separators=(",", ":")).encode()
+
+
+def _summary(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the part of an account's data entity states are read from."""
+    return {key: value for key, value in data.items() if key != "schedule"}
+
+
+@dataclass(slots=True, eq=False)
+class _Block:
+    """A schedule and every account whose data holds it.
+
+    Accounts with the same payload share one parsed schedule, so it is
+    charged once. It stays parsed while any of them is resident and is
+    packed into compact JSON bytes once none is, never both.
+    """
+
+    schedule: Schedule | None
+    compact: bytes | None
+    size: int
+    users: int = 0
+    resident: int = 0
+
+
+@dataclass(slots=True)
+class _Record:
+    """One account's always resident summary and, while read, its data."""
+
+    summary: dict[str, Any]
+    summary_bytes: int
+    fetched: float
+    block: _Block
+    version: int
+    data: dict[str, Any] | None = None
+    last_access: float = 0.0
+
+
+class DataCache:
+    """Keep the parsed data of all accounts within one byte budget.
+
+    Every account keeps the small summary its entities show. Its schedule
+    is parsed only while explicit reads (calendar queries, dashboard
+    subscriptions, reminders) use it; accounts not read for ttl seconds, and
+    the least recently read ones while the total is over max_bytes, are
+    evicted, and a schedule no resident account holds is packed into
+    compact bytes until the next explicit read parses it again. Entity state
+    reads peek at what is resident and never rebuild, so they neither keep
+    an account resident nor churn the budget. Everything is persisted so it
+    survives restarts. Only touched from the event loop.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: float,
+        schedule_cache: ScheduleCache | None = None,
+        persist: Callable[[], Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache."""
+        self.max_bytes = max_bytes
+        self._ttl = ttl
+        self._schedule_cache = schedule_cache
+        self._persist = persist
+        self._clock = clock
+        self._records: OrderedDict[str, _Record] = OrderedDict()
+        # Parsed blocks by schedule, which they keep alive so ids are unique
+        self._blocks: dict[int, _Block] = {}
+        self.bytes = 0
+        self.resident = 0
+        # Stamped on every record stored, so readers can tell new data apart
+        self._version = 0
+        self.hits = 0
+        self.rebuilds = 0
+        self.evictions = {EVICT_SIZE: 0, EVICT_TTL: 0}
+
+    def __contains__(self, entry_id: str) -> bool:
+        """Return whether an account has cached data."""
+        return entry_id in self._records
+
+    def entry_bytes(self, entry_id: str) -> int:
+        """Return the bytes cached for one account, with its share of a schedule."""
+        if (record := self._records.get(entry_id)) is None:
+            return 0
+        return record.summary_bytes + record.block.size // record.block.users
+
+    def fetched(self, entry_id: str) -> float | None:
+        """Return the Unix time an account's cached data was fetched."""
+        record = self._records.get(entry_id)
+        return record.fetched if record else None
+
+    def version(self, entry_id: str) -> int | None:
+        """Return a stamp that changes whenever an account's data is replaced.
+
+        Eviction and rebuilds keep it, they do not change the data.
+        """
+        record = self._records.get(entry_id)
+        return record.version if record else None
+
+    def put(
+        self, entry_id: str, data: dict[str, Any], fetched: float | None = None
+    ) -> None:
+        """Store freshly fetched data for an account."""
+        previous = self._records.pop(entry_id, None)
+        summary = _summary(data)
+        record = _Record(
+            summary=summary,
+            summary_bytes=approximate_size(summary),
+            fetched=time.time() if fetched is None else fetched,
+            block=self._parsed_block(data["schedule"]),
+            version=self._next_version(),
+        )
+        record.block.users += 1
+        self._records[entry_id] = record
+        self.bytes += record.summary_bytes
+        self._load(record)
+        # Released after the new data holds its block, which may be the same
+        if previous is not None:
+            self._drop(previous)
+        self._enforce(entry_id)
+        if self._persist:
+            self._persist()
+
+    def peek(self, entry_id: str) -> dict[str, Any] | None:
+        """Return an account's data as resident, without counting a read.
+
+        An evicted account has no schedule, only its summary.
+        """
+        if (record := self._records.get(entry_id)) is None:
+            return None
+        return record.data if record.data is not None else record.summary
+
+    def get(self, entry_id: str) -> dict[str, Any] | None:
+        """Return an account's full data for an explicit read.
+
+        Counts as a use for eviction and parses the schedule again if it was
+        packed.
+        """
+        if (record := self._records.get(entry_id)) is None:
+            return None
+        self._records.move_to_end(entry_id)
+        record.last_access = self._clock()
+        if record.data is not None:
+            self.hits += 1
+            return record.data
+
+        self._load(record)
+        self._enforce(entry_id)
+        return record.data
+
+    def load(self, entry_id: str) -> dict[str, Any] | None:
+        """Return an account's full data without counting a read or caching it."""
+        if (record := self._records.get(entry_id)) is None:
+            return None
+        if record.data is not None:
+            return record.data
+        block = record.block
+        schedule = block.schedule or Schedule(expand_events(json.loads(block.compact)))
+        return {**record.summary, "schedule": schedule}
+
+    def evict(self, entry_id: str, reason: str | None = None) -> None:
+        """Drop an account's data, packing its schedule if no one else reads it."""
+        record = self._records.get(entry_id)
+        if record is None or record.data is None:
+            return
+        self._unload(record)
+        if reason is not None:
+            self.evictions[reason] += 1
+        if not record.block.resident:
+            self._pack(record.block)
+
+    def remove(self, entry_id: str) -> None:
+        """Forget an account entirely."""
+        if (record := self._records.pop(entry_id, None)) is None:
+            return
+        self._drop(record)
+        if self._persist:
+            self._persist()
+
+    def evict_expired(self) -> None:
+        """Evict the parsed data of accounts not read within the ttl."""
+        cutoff = self._clock() - self._ttl
+        for entry_id, record in list(self._records.items()):
+            if record.data is not None and record.last_access < cutoff:
+                self.evict(entry_id, EVICT_TTL)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return every account's compact form for storage."""
+        return {
+            entry_id: {
+                "fetched": record.fetched,
+                "schedule": (
+                    compact_events(record.block.schedule.events)
+                    if record.block.schedule is not None
+                    else json.loads(record.block.compact)
+                ),
+                **summary_to_compact(record.summary),
+            }
+            for entry_id, record in self._records.items()
+        }
+
+    def restore(self, stored: Mapping[str, Any]) -> None:
+        """Load compact forms saved by snapshot, parsing only the summaries."""
+        packed: dict[bytes, _Block] = {}
+        for entry_id, item in stored.items():
+            compact = json.dumps(item["schedule"], separators=(",", ":")).encode()
+            if (block := packed.get(compact)) is None:
+                block = packed[compact] = _Block(
+                    schedule=None, compact=compact, size=approximate_size(compact)
+                )
+                self.bytes += block.size
+            block.users += 1
+            summary = summary_from_compact(item)
+            record = _Record(
+                summary=summary,
+                summary_bytes=approximate_size(summary),
+                fetched=item["fetched"],
+                block=block,
+                version=self._next_version(),
+            )
+            self._records[entry_id] = record
+            self.bytes += record.summary_bytes
+
+    def _next_version(self) -> int:
+        """Return a new record version."""
+        self._version += 1
+        return self._version
+
+    def _parsed_block(self, schedule: Schedule) -> _Block:
+        """Return the block holding a parsed schedule, charging a new one."""
+        if (block := self._blocks.get(id(schedule))) is None:
+            block = _Block(
+                schedule=schedule, compact=None, size=approximate_size(schedule)
+            )
+            self._blocks[id(schedule)] = block
+            self.bytes += block.size
+        return block
+
+    def _load(self, record: _Record) -> None:
+        """Make an account's data resident, parsing its schedule if packed."""
+        block = record.block
+        if block.schedule is None:
+            self.rebuilds += 1
+            block.schedule = Schedule(expand_events(json.loads(block.compact)))
+            block.compact = None
+            self._resize(block, approximate_size(block.schedule))
+            self._blocks[id(block.schedule)] = block
+        record.data = {**record.summary, "schedule": block.schedule}
+        record.last_access = self._clock()
+        block.resident += 1
+        self.resident += 1
+        self.bytes += sys.getsizeof(record.data)
+
+    def _unload(self, record: _Record) -> None:
+        """Drop an account's resident data, leaving its block to the caller."""
+        self.bytes -= sys.getsizeof(record.data)
+        record.data = None
+        record.block.resident -= 1
+        self.resident -= 1
+
+    def _pack(self, block: _Block) -> None:
+        """Replace a schedule no resident account holds by its compact bytes."""
+        schedule = block.schedule
+        del self._blocks[id(schedule)]
+        block.schedule = None
+        block.compact = encode_schedule(schedule)
+        self._resize(block, approximate_size(block.compact))
+        if self._schedule_cache is not None:
+            self._schedule_cache.discard(schedule)
+
+    def _drop(self, record: _Record) -> None:
+        """Release a replaced or removed account's summary and schedule."""
+        block = record.block
+        self.bytes -= record.summary_bytes
+        if record.data is not None:
+            self._unload(record)
+        block.users -= 1
+        if not block.users:
+            if block.schedule is not None:
+                del self._blocks[id(block.schedule)]
+                if self._schedule_cache is not None:
+                    self._schedule_cache.discard(block.schedule)
+            self.bytes -= block.size
+        elif not block.resident and block.schedule is not None:
+            self._pack(block)
+
+    def _resize(self, block: _Block, size: int) -> None:
+        """Account for a block switching between parsed and packed."""
+        self.bytes += size - block.size
+        block.size = size
+
+    def _enforce(self, keep: str) -> None:
+        """Evict the least recently read accounts until within the budget."""
+        for entry_id in list(self._records):
+            if self.bytes <= self.max_bytes:
+                return
+            if entry_id != keep:
+                self.evict(entry_id, EVICT_SIZE)
+        if self.bytes > self.max_bytes:
+            LOGGER.debug(
+                "Cached data uses %d bytes, over the %d byte limit",
+                self.bytes,
+                self.max_bytes,
+            )
@@ -1,16 +1,36 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import Platform
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_CALENDAR, DOMAIN
+from .entity import async_remove_stale_entities
+from .schedule import MergedSchedule
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
+    from .cache import DataCache
     from .coordinator import GreyhoundDataUpdateCoordinator
     from .data import GreyhoundConfigEntry
+    from .schedule import AccountEvent, CollectionEvent
+
+PREDICTED_DESCRIPTION = "Predicted from the collection pattern"
+
+
+def collection_summary(bins: tuple[str, ...]) -> str:
+    """Return the calendar summary for the bins collected on a day."""
+    # Format bins with colored squares
+    if "GREEN" in bins:
+        return "Bin Collection: 🟩 Green Bin"
+    return "Bin Collection: 🟫⬛ Brown & Black Bins"
 
 
 async def async_setup_entry(
@@ -20,7 +40,25 @@ async def async_setup_entry(
 ) -> None:
     """Set up the calendar platform."""
     coordinator = entry.runtime_data.coordinator
-    async_add_entities([GreyhoundBinCalendar(coordinator)])
+    entities: list[CalendarEntity] = []
+    if entry.options.get(CONF_CALENDAR, True):
+        entities.append(GreyhoundBinCalendar(coordinator))
+    async_remove_stale_entities(
+        hass, entry, Platform.CALENDAR, {entity.unique_id for entity in entities}
+    )
+    async_add_entities(entities)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the aggregate calendar enabled in configuration.yaml."""
+    if discovery_info is None:
+        return
+    async_add_entities([GreyhoundAggregateCalendar(hass.data[DOMAIN].data_cache)])
 
 
 class GreyhoundBinCalendar(CalendarEntity):
@@ -38,27 +76,10 @@ class GreyhoundBinCalendar(CalendarEntity):
         events = self.coordinator.data.get("events", [])
 
         for event in events:
-            event_date = event.get("date")
-            if isinstance(event_date, datetime):
-                event_date = event_date.date()
-
+            event_date = event.date
             if event_date >= now:
-                bins = event.get("bins", [])
-                # Format bins with colored squares
-                bin_labels = []
-                if "GREEN" in bins:
-                    bin_labels.append("🟩 Green Bin")
-                else:
-                    bin_labels.append("🟫⬛ Brown & Black Bins")
-                # Add any other bin types here as needed
-
-                summary = (
-                    f"Bin Collection: {', '.join(bin_labels)}"
-                    if bin_labels
-                    else "Bin Collection"
-                )
                 return CalendarEvent(
-                    summary=summary,
+                    summary=collection_summary(event.bins),
                     start=event_date,
                     end=event_date + timedelta(days=1),
                 )
@@ -72,33 +93,123 @@ class GreyhoundBinCalendar(CalendarEntity):
         end_date: datetime,
     ) -> list[CalendarEvent]:
         """Return calendar events between start and end."""
-        events = self.coordinator.data.get("events", [])
+        if (data := self.coordinator.async_touch()) is None:
+            return []
+        first, last = start_date.date(), end_date.date() - timedelta(days=1)
+        events = [(event, None) for event in data["schedule"].between(first, last)]
+        # Extrapolated collections past the portal's horizon
+        events.extend(
+            (event, PREDICTED_DESCRIPTION)
+            for event in data.get("predicted", ())
+            if first <= event.date <= last
+        )
         result = []
 
-        for event in events:
-            date = event["date"]
-            if isinstance(date, datetime):
-                date = date.date()
-
+        for event, description in events:
+            date = event.date
             if start_date.date() <= date < end_date.date():
-                bins = event.get("bins", [])
-                bin_labels = []
-                if "GREEN" in bins:
-                    bin_labels.append("🟩 Green Bin")
-                else:
-                    bin_labels.append("🟫⬛ Brown & Black Bins")
-
-                summary = (
-                    f"Bin Collection: {', '.join(bin_labels)}"
-                    if bin_labels
-                    else "Bin Collection"
-                )
-
                 result.append(
                     CalendarEvent(
-                        summary=summary,
+                        summary=collection_summary(event.bins),
                         start=date,
                         end=date + timedelta(days=1),
+                        description=description,
                     )
                 )
         return result
+
+
+class GreyhoundAggregateCalendar(CalendarEntity):
+    """One calendar for the collections of every loaded account.
+
+    Not tied to any config entry. Both the next event and range queries are
+    answered from a k-way merge of the accounts' full schedules. An account
+    is read again only when the data cache stamps it with a new version, so
+    a poll costs one stamp per account and keeps no account resident.
+    """
+
+    _attr_name = "Greyhound Bin Collections (all accounts)"
+    _attr_unique_id = f"{DOMAIN}_aggregate_calendar"
+
+    def __init__(self, data_cache: DataCache) -> None:
+        """Initialize the calendar."""
+        self._data_cache = data_cache
+        # Title and data version per entry id, as last merged
+        self._versions: dict[str, tuple[str, int | None]] = {}
+        self._sources: dict[
+            str, tuple[str, tuple[CollectionEvent, ...], tuple[CollectionEvent, ...]]
+        ] = {}
+        self._merged = MergedSchedule(())
+
+    def _loaded_entries(self) -> list[GreyhoundConfigEntry]:
+        """Return the entries whose accounts are shown."""
+        return [
+            entry
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+        ]
+
+    def _async_merged(self) -> MergedSchedule:
+        """Return the merged schedule, rebuilding it if an account changed."""
+        versions = {
+            entry.entry_id: (entry.title, self._data_cache.version(entry.entry_id))
+            for entry in self._loaded_entries()
+        }
+        if versions == self._versions:
+            return self._merged
+
+        sources = {}
+        for entry_id, (title, version) in versions.items():
+            if version is None:
+                continue
+            if self._versions.get(entry_id) == (title, version):
+                sources[entry_id] = self._sources[entry_id]
+            elif (data := self._data_cache.load(entry_id)) is not None:
+                sources[entry_id] = (
+                    title,
+                    data["schedule"].events,
+                    data.get("predicted", ()),
+                )
+        self._versions = versions
+        self._sources = sources
+        self._merged = MergedSchedule(
+            stream
+            for account, events, predicted in sources.values()
+            for stream in (
+                (account, events, False),
+                (account, predicted, True),
+            )
+        )
+        return self._merged
+
+    @staticmethod
+    def _calendar_event(item: AccountEvent) -> CalendarEvent:
+        """Return a merged event labelled with its account."""
+        return CalendarEvent(
+            summary=f"{item.account}: {collection_summary(item.event.bins)}",
+            start=item.event.date,
+            end=item.event.date + timedelta(days=1),
+            description=PREDICTED_DESCRIPTION if item.predicted else None,
+        )
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next upcoming collection of any account."""
+        item = self._async_merged().next_from(dt_util.now().date())
+        return self._calendar_event(item) if item else None
+
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return the collections of every account between start and end."""
+        # A query reads every account, which keeps lazy accounts fresh
+        for entry in self._loaded_entries():
+            entry.runtime_data.coordinator.async_note_read()
+        last: date = end_date.date() - timedelta(days=1)
+        return [
+            self._calendar_event(item)
+            for item in self._async_merged().between(start_date.date(), last)
+        ]
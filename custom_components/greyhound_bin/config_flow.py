@@ -7,11 +7,37 @@ from typing import Any
 
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigFlowResult
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import (
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 import voluptuous as vol
 
-from .api import GreyhoundApiClient, GreyhoundAPIError
-from .const import DOMAIN
+from .api import GreyhoundAPIAuthError, GreyhoundApiClient, GreyhoundAPIError
+from .const import (
+    BIN_DESCRIPTIONS,
+    CONF_ACCNO,
+    CONF_CALENDAR,
+    CONF_ENTITY_PROFILE,
+    CONF_FRESHNESS_HOURS,
+    CONF_LAZY_REFRESH,
+    CONF_PREDICTIVE_POLLING,
+    CONF_REMINDER_OFFSETS,
+    CONF_SERVICE_NOTICES,
+    CONF_TRACE_SAMPLE_PERCENT,
+    DEFAULT_FRESHNESS_HOURS,
+    DOMAIN,
+    ENTITY_PROFILE_COMPACT,
+    ENTITY_PROFILE_FULL,
+    MAX_FRESHNESS_HOURS,
+    REMINDER_MAX_OFFSET_HOURS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +57,14 @@ class GreyhoundBinConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
     _reauth_entry: config_entries.ConfigEntry | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> GreyhoundBinOptionsFlow:
+        """Get the options flow for this handler."""
+        return GreyhoundBinOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -54,8 +88,10 @@ class GreyhoundBinConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     data=user_input,
                 )
 
-            except GreyhoundAPIError:
+            except GreyhoundAPIAuthError:
                 errors["base"] = "invalid_auth"
+            except GreyhoundAPIError:
+                errors["base"] = "cannot_connect"
             except Exception:
                 _LOGGER.exception("Unexpected error during config flow")
                 errors["base"] = "unknown"
@@ -87,5 +123,113 @@ class GreyhoundBinConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return await self.async_step_user()
 
     async def async_step_import(self, user_input: dict[str, Any]) -> ConfigFlowResult:
-        """Handle import from YAML config."""
-        return await self.async_step_user(user_input)
+        """Create an entry for an account the bulk import already validated."""
+        await self.async_set_unique_id(user_input[CONF_ACCNO])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=f"Greyhound Bin ({user_input[CONF_ACCNO]})", data=user_input
+        )
+
+
+class GreyhoundBinOptionsFlow(config_entries.OptionsFlow):
+    """Handle Greyhound Bin options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage reminder offsets, polling and the entity profile."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={
+                    **self.config_entry.options,
+                    CONF_PREDICTIVE_POLLING: user_input[CONF_PREDICTIVE_POLLING],
+                    CONF_LAZY_REFRESH: user_input[CONF_LAZY_REFRESH],
+                    CONF_FRESHNESS_HOURS: user_input[CONF_FRESHNESS_HOURS],
+                    CONF_SERVICE_NOTICES: user_input[CONF_SERVICE_NOTICES],
+                    CONF_ENTITY_PROFILE: user_input[CONF_ENTITY_PROFILE],
+                    CONF_CALENDAR: user_input[CONF_CALENDAR],
+                    CONF_TRACE_SAMPLE_PERCENT: user_input[CONF_TRACE_SAMPLE_PERCENT],
+                    CONF_REMINDER_OFFSETS: {
+                        bin_type: user_input[f"reminder_{bin_type.lower()}"]
+                        for bin_type in BIN_DESCRIPTIONS
+                    },
+                }
+            )
+
+        options = self.config_entry.options
+        offsets = options.get(CONF_REMINDER_OFFSETS, {})
+        hours = NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=REMINDER_MAX_OFFSET_HOURS,
+                step=0.5,
+                unit_of_measurement="h",
+                mode=NumberSelectorMode.BOX,
+            )
+        )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        f"reminder_{bin_type.lower()}",
+                        default=offsets.get(bin_type, 0),
+                    ): hours
+                    for bin_type in BIN_DESCRIPTIONS
+                }
+            ).extend(
+                {
+                    vol.Required(
+                        CONF_PREDICTIVE_POLLING,
+                        default=options.get(CONF_PREDICTIVE_POLLING, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_LAZY_REFRESH,
+                        default=options.get(CONF_LAZY_REFRESH, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_FRESHNESS_HOURS,
+                        default=options.get(
+                            CONF_FRESHNESS_HOURS, DEFAULT_FRESHNESS_HOURS
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=1,
+                            max=MAX_FRESHNESS_HOURS,
+                            step=1,
+                            unit_of_measurement="h",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_SERVICE_NOTICES,
+                        default=options.get(CONF_SERVICE_NOTICES, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_ENTITY_PROFILE,
+                        default=options.get(CONF_ENTITY_PROFILE, ENTITY_PROFILE_FULL),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[ENTITY_PROFILE_FULL, ENTITY_PROFILE_COMPACT],
+                            mode=SelectSelectorMode.LIST,
+                            translation_key=CONF_ENTITY_PROFILE,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_CALENDAR, default=options.get(CONF_CALENDAR, True)
+                    ): bool,
+                    vol.Required(
+                        CONF_TRACE_SAMPLE_PERCENT,
+                        default=options.get(CONF_TRACE_SAMPLE_PERCENT, 0),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=100,
+                            step=1,
+                            unit_of_measurement="%",
+                            mode=NumberSelectorMode.SLIDER,
+                        )
+                    ),
+                }
+            ),
+        )
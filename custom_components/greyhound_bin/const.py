@@ -12,6 +12,17 @@ ISSUE_URL = "https://github.com/JosyBan/greyhound_bin/issues"
 # Configuration and options
 CONF_ACCNO = "account number"
 CONF_PIN = "pin"
+CONF_REMINDER_OFFSETS = "reminder_offsets"
+CONF_PREDICTIVE_POLLING = "predictive_polling"
+CONF_ENTITY_PROFILE = "entity_profile"
+CONF_CALENDAR = "calendar"
+CONF_TRACE_SAMPLE_PERCENT = "trace_sample_percent"
+CONF_LAZY_REFRESH = "lazy_refresh"
+CONF_FRESHNESS_HOURS = "freshness_hours"
+CONF_SERVICE_NOTICES = "service_notices"
+
+ENTITY_PROFILE_FULL = "full"
+ENTITY_PROFILE_COMPACT = "compact"
 
 # Logging
 LOGGER: Logger = getLogger(__package__)
@@ -20,9 +31,39 @@ LOGGER: Logger = getLogger(__package__)
 # API URLs
 LOGIN_URL = "https://app.greyhound.ie/"
 CALENDAR_URL = "https://app.greyhound.ie/collection/collection_calendar"
+NOTICES_URL = "https://app.greyhound.ie/notifications"
+
+# Request types, timed separately per host
+REQUEST_LOGIN_PAGE = "login_page"
+REQUEST_LOGIN_POST = "login_post"
+REQUEST_CALENDAR = "calendar"
+REQUEST_NOTICES = "notices"
+
+# Adaptive timeouts in seconds, used until enough latency has been seen
+TIMEOUT_DEFAULTS = {
+    REQUEST_LOGIN_PAGE: 10.0,
+    REQUEST_LOGIN_POST: 10.0,
+    REQUEST_CALENDAR: 10.0,
+    REQUEST_NOTICES: 5.0,
+}
+TIMEOUT_CONNECT = 5.0
+TIMEOUT_FLOOR = 2.0
+TIMEOUT_CEILING = 30.0
+TIMEOUT_PERCENTILE = 0.95
+TIMEOUT_MULTIPLIER = 2.0
+TIMEOUT_WINDOW = 50
+TIMEOUT_MIN_SAMPLES = 5
+
+NO_DISRUPTION = "No disruptions"
 
 
 UPDATE_INTERVAL_HOURS = 3
+PREDICTIVE_UPDATE_INTERVAL_HOURS = 24
+
+# Lazy refresh, started when data older than the freshness limit is read
+DEFAULT_FRESHNESS_HOURS = 24
+MAX_FRESHNESS_HOURS = 168
+LAZY_RETRY_MINUTES = 15
 
 BIN_DESCRIPTIONS = {
     "BLACK": "General waste",
@@ -36,3 +77,76 @@ BIN_ORDER = {
     "BROWN": 1,
     "GREEN": 2,
 }
+
+# Services
+SERVICE_PROFILE = "profile"
+SERVICE_IMPORT_ACCOUNTS = "import_accounts"
+
+ATTR_ENTRY_ID = "entry_id"
+ATTR_REFRESHES = "refreshes"
+ATTR_SECONDS = "seconds"
+ATTR_ACCOUNTS = "accounts"
+ATTR_PATH = "path"
+ATTR_CONCURRENCY = "concurrency"
+
+# Bulk import, entries refreshing for the first time at once
+FIRST_REFRESH_CONCURRENCY = 5
+
+# Profiling, sessions wait for refreshes that happen anyway
+PROFILE_DEFAULT_SECONDS = 3600
+PROFILE_MAX_SECONDS = 86400
+PROFILE_TOP_FUNCTIONS = 15
+PROFILE_TRACEMALLOC_FRAMES = 10
+
+# Schedule parsing
+EVENT_HORIZON_DAYS = 30
+SCHEDULE_CACHE_SIZE = 256
+
+# Integration-wide budget for parsed account data, set in configuration.yaml
+CONF_CACHE_SIZE_KIB = "cache_size_kib"
+CONF_CACHE_TTL_HOURS = "cache_ttl_hours"
+# One calendar with every account's collections, also set in configuration.yaml
+CONF_AGGREGATE_CALENDAR = "aggregate_calendar"
+DEFAULT_CACHE_SIZE_KIB = 4096
+DEFAULT_CACHE_TTL_HOURS = 24
+CACHE_SWEEP_MINUTES = 10
+CACHE_STORAGE_KEY = f"{DOMAIN}.cache"
+CACHE_STORAGE_VERSION = 1
+CACHE_SAVE_DELAY = 60
+
+# Events
+EVENT_SCHEDULE_CHANGED = f"{DOMAIN}_schedule_changed"
+EVENT_REMINDER = f"{DOMAIN}_reminder"
+EVENT_PROFILE_FINISHED = f"{DOMAIN}_profile_finished"
+
+# Dispatcher signal sent with (entry_id, schedule) when a new schedule arrives
+SIGNAL_SCHEDULE_UPDATED = f"{DOMAIN}_schedule_updated"
+
+# Websocket commands
+WS_SUBSCRIBE = f"{DOMAIN}/subscribe"
+
+# Reminders, hours before the start of the collection day
+REMINDER_MAX_OFFSET_HOURS = 168
+
+# Fleet fetcher
+FLEET_CONCURRENCY = 20
+FLEET_PROGRESS_INTERVAL = 5
+FLEET_COMMIT_EVERY = 100
+# Directory under the config directory that import_accounts reads files from
+IMPORT_DIRECTORY = DOMAIN
+
+# Metrics
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+METRICS_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Tracing
+TRACE_LOG_FILE = f"{DOMAIN}_traces.jsonl"
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_BACKUP_COUNT = 3
+
+# Recurrence inference
+RECURRENCE_MIN_EVENTS = 4
+RECURRENCE_MIN_CONFIDENCE = 0.75
+RECURRENCE_MAX_CYCLE = 4
+PREDICTION_HORIZON_DAYS = 90
+PREDICTION_MAX_OUTAGE_DAYS = 14
@@ -1,25 +1,338 @@
+from collections.abc import Mapping
+from datetime import timedelta
 import logging
+import time
 from typing import Any
 
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util.event_type import EventType
 
-from .api import GreyhoundAPICommunicationError, GreyhoundAPIError
-from .data import GreyhoundConfigEntry
+from .api import (
+    GreyhoundAPIAuthError,
+    GreyhoundAPICommunicationError,
+    GreyhoundAPIError,
+)
+from .const import (
+    CONF_FRESHNESS_HOURS,
+    CONF_LAZY_REFRESH,
+    CONF_PREDICTIVE_POLLING,
+    CONF_TRACE_SAMPLE_PERCENT,
+    DEFAULT_FRESHNESS_HOURS,
+    DOMAIN,
+    EVENT_HORIZON_DAYS,
+    EVENT_SCHEDULE_CHANGED,
+    LAZY_RETRY_MINUTES,
+    PREDICTION_HORIZON_DAYS,
+    PREDICTION_MAX_OUTAGE_DAYS,
+    PREDICTIVE_UPDATE_INTERVAL_HOURS,
+    SIGNAL_SCHEDULE_UPDATED,
+    UPDATE_INTERVAL_HOURS,
+)
+from .data import GreyhoundConfigEntry, ScheduleChangedData
+from .metrics import RefreshMetrics
+from .recurrence import Recurrence, infer_recurrence, prediction_error
+from .schedule import CollectionEvent, Schedule, build_summary, diff_schedules
 
 _LOGGER = logging.getLogger(__name__)
 
+SCHEDULE_CHANGED: EventType[ScheduleChangedData] = EventType(EVENT_SCHEDULE_CHANGED)
+
+
+def _event_dict(event: CollectionEvent) -> dict[str, str | list[str]]:
+    """Return a collection event as JSON-friendly event data."""
+    return {"date": event.date.isoformat(), "bins": list(event.bins)}
+
 
 class GreyhoundDataUpdateCoordinator(DataUpdateCoordinator):
     """Coordinator to fetch bin events from Greyhound."""
 
     config_entry: GreyhoundConfigEntry
 
+    def __init__(self, hass: HomeAssistant, *args: Any, **kwargs: Any) -> None:
+        """Initialize the coordinator."""
+        self._data_cache = hass.data[DOMAIN].data_cache
+        self._cache_id: str | None = None
+        super().__init__(hass, *args, **kwargs)
+        self._cache_id = self.config_entry.entry_id
+        self.metrics = RefreshMetrics()
+        self.recurrence: Recurrence | None = None
+        self._lazy_refreshing = False
+
+    @property
+    def data(self) -> dict[str, Any] | None:
+        """Return the entry's resident data, without counting a read.
+
+        Entity states read this. An evicted entry has no schedule here, only
+        its summary; explicit reads go through async_touch instead.
+        """
+        if self._cache_id is None:
+            return None
+        return self._data_cache.peek(self._cache_id)
+
+    @data.setter
+    def data(self, data: dict[str, Any] | None) -> None:
+        """Hand fetched data to the integration-wide cache."""
+        if self._cache_id is not None and data is not None:
+            self._data_cache.put(self._cache_id, data)
+
+    @callback
+    def async_restore(self) -> bool:
+        """Serve the stored data of a lazy entry instead of a first refresh."""
+        fetched = self._data_cache.fetched(self.config_entry.entry_id)
+        if not self.lazy or fetched is None:
+            return False
+        self.metrics.last_success = fetched
+        self.recurrence = infer_recurrence(
+            self._data_cache.load(self.config_entry.entry_id)["schedule"]
+        )
+        return True
+
+    def current_view(
+        self,
+    ) -> tuple[tuple[CollectionEvent, ...], Mapping[str, Any]] | None:
+        """Return today's upcoming events and sensor fields.
+
+        Computed when read rather than taken from the last refresh, so day
+        counts stay right on entries that go days without one. Predicted
+        events stand in once the fetched schedule has run out.
+        """
+        if not (data := self.data):
+            return None
+        today = dt_util.now().date()
+        if (schedule := data.get("schedule")) is not None:
+            events, summary = schedule.view(today, EVENT_HORIZON_DAYS)
+        else:
+            # Evicted, the events kept from the last refresh reach far enough
+            events = tuple(event for event in data["events"] if event.date >= today)
+            summary = build_summary(events, today)
+        if not events:
+            last = today + timedelta(days=EVENT_HORIZON_DAYS)
+            events = tuple(
+                event
+                for event in data.get("predicted", ())
+                if today <= event.date <= last
+            )
+            summary = build_summary(events, today)
+        if "service_disruption" in data["sensors"]:
+            summary = {
+                **summary,
+                "service_disruption": data["sensors"]["service_disruption"],
+            }
+        return events, summary
+
+    @property
+    def lazy(self) -> bool:
+        """Return whether the entry refreshes on read instead of polling."""
+        return bool(self.config_entry.options.get(CONF_LAZY_REFRESH))
+
+    @callback
+    def async_touch(self) -> dict[str, Any] | None:
+        """Return the full data for an explicit read, refreshing it if stale.
+
+        Calendar queries, dashboard subscriptions and reminders read through
+        here; only these reads keep the parsed data in memory. In lazy mode,
+        stale data is also refreshed in the background: the caller keeps
+        serving the current data and listeners are updated when the refresh
+        finishes. A failed refresh is retried on a later read, but not more
+        often than every few minutes.
+        """
+        data = self._data_cache.get(self.config_entry.entry_id)
+        self.async_note_read()
+        return data
+
+    @callback
+    def async_note_read(self) -> None:
+        """Count an explicit read served elsewhere, refreshing if stale.
+
+        For readers with their own copy of the data, such as the aggregate
+        calendar, that should still keep a lazy entry fresh.
+        """
+        if self.lazy and not self._lazy_refreshing:
+            self._async_refresh_if_stale()
+
+    @callback
+    def _async_refresh_if_stale(self) -> None:
+        """Start a lazy refresh unless the data is fresh or just failed."""
+        now = time.time()
+        freshness = timedelta(
+            hours=self.config_entry.options.get(
+                CONF_FRESHNESS_HOURS, DEFAULT_FRESHNESS_HOURS
+            )
+        )
+        last_success = self.metrics.last_success
+        last_attempt = self.metrics.last_attempt
+        if (
+            last_success is not None and now - last_success < freshness.total_seconds()
+        ) or (
+            last_attempt is not None
+            and last_attempt != last_success
+            and now - last_attempt < LAZY_RETRY_MINUTES * 60
+        ):
+            return
+
+        self._lazy_refreshing = True
+        self.metrics.lazy_refreshes += 1
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_lazy_refresh(),
+            f"{DOMAIN} lazy refresh {self.config_entry.entry_id}",
+        )
+
+    async def _async_lazy_refresh(self) -> None:
+        """Refresh after a stale read."""
+        try:
+            await self.async_refresh()
+        finally:
+            self._lazy_refreshing = False
+
     async def _async_update_data(self) -> Any:
         """Fetch data from API client."""
+        domain_data = self.hass.data[DOMAIN]
+        entry_id = self.config_entry.entry_id
+        started = time.monotonic()
         try:
-            return await self.config_entry.runtime_data.client.async_get_data()
-        except GreyhoundAPICommunicationError as err:
-            raise ConfigEntryAuthFailed(err) from err
-        except GreyhoundAPIError as err:
-            raise UpdateFailed(err) from err
+            with (
+                domain_data.tracer.trace(
+                    f"{DOMAIN}.refresh",
+                    self.config_entry.options.get(CONF_TRACE_SAMPLE_PERCENT, 0) / 100,
+                    entry_id=entry_id,
+                ),
+                domain_data.profiler.track(entry_id),
+            ):
+                data = await self.config_entry.runtime_data.client.async_get_data()
+        except Exception as err:
+            self._async_observe_refresh(started, err)
+            if (predicted := self._async_predicted_data(err)) is not None:
+                return predicted
+            if isinstance(err, GreyhoundAPICommunicationError):
+                raise ConfigEntryAuthFailed(err) from err
+            if isinstance(err, GreyhoundAPIError):
+                raise UpdateFailed(err) from err
+            raise
+        self._async_observe_refresh(started)
+
+        schedule = data["schedule"]
+        # Parsed again if evicted, so compared by content rather than identity
+        previous = self._data_cache.load(entry_id)
+        previous_schedule = previous["schedule"] if previous else None
+        if previous_schedule is not None:
+            self._async_fire_schedule_changed(previous_schedule, schedule)
+        if previous_schedule is None or previous_schedule.events != schedule.events:
+            async_dispatcher_send(
+                self.hass, SIGNAL_SCHEDULE_UPDATED, entry_id, schedule
+            )
+        self._async_update_recurrence(previous_schedule, schedule)
+        data["predicted"] = (
+            self.recurrence.extend(
+                schedule,
+                dt_util.now().date() + timedelta(days=PREDICTION_HORIZON_DAYS),
+            )
+            if self.recurrence
+            else ()
+        )
+        return data
+
+    def _async_update_recurrence(
+        self, previous: Schedule | None, schedule: Schedule
+    ) -> None:
+        """Check the last prediction against a new schedule and relearn it."""
+        if previous is not None and previous.events == schedule.events:
+            return
+
+        error = None
+        if self.recurrence is not None and previous is not None:
+            error = prediction_error(self.recurrence, previous, schedule)
+            if error is not None:
+                self.metrics.observe_prediction(error)
+                if error:
+                    _LOGGER.info(
+                        "Predicted schedule for %s was corrected on %d days",
+                        self.config_entry.entry_id,
+                        error,
+                    )
+
+        self.recurrence = infer_recurrence(schedule)
+
+        if self.config_entry.options.get(CONF_PREDICTIVE_POLLING) and not self.lazy:
+            # Only confirm a reliable prediction occasionally
+            hours = (
+                PREDICTIVE_UPDATE_INTERVAL_HOURS
+                if self.recurrence is not None and not error
+                else UPDATE_INTERVAL_HOURS
+            )
+            self.update_interval = timedelta(hours=hours)
+
+    def _async_predicted_data(self, err: Exception) -> dict[str, Any] | None:
+        """Return the last data extended by the recurrence during an outage."""
+        if (
+            not isinstance(err, GreyhoundAPIError)
+            or isinstance(err, GreyhoundAPIAuthError)
+            or (previous := self._data_cache.load(self.config_entry.entry_id)) is None
+            or self.recurrence is None
+            or self.metrics.last_success is None
+            or time.time() - self.metrics.last_success
+            > timedelta(days=PREDICTION_MAX_OUTAGE_DAYS).total_seconds()
+        ):
+            return None
+
+        schedule = previous["schedule"]
+        today = dt_util.now().date()
+        combined = Schedule(
+            schedule.events
+            + self.recurrence.extend(
+                schedule, today + timedelta(days=EVENT_HORIZON_DAYS)
+            )
+        )
+        events, summary = combined.view(today, EVENT_HORIZON_DAYS)
+        self.metrics.predicted_refreshes += 1
+        _LOGGER.warning(
+            "Refresh of %s failed (%s), serving the predicted schedule",
+            self.config_entry.entry_id,
+            err,
+        )
+        sensors = dict(summary)
+        if "service_disruption" in previous["sensors"]:
+            sensors["service_disruption"] = previous["sensors"]["service_disruption"]
+        return {**previous, "events": events, "sensors": sensors}
+
+    def _async_observe_refresh(
+        self, started: float, error: BaseException | None = None
+    ) -> None:
+        """Record refresh metrics for the metrics endpoint."""
+        duration = time.monotonic() - started
+        self.metrics.observe(duration, error)
+        self.hass.data[DOMAIN].refresh_latency.observe(duration)
+
+    def _async_fire_schedule_changed(self, old: Schedule, new: Schedule) -> None:
+        """Fire an event with the collection days that moved since last refresh."""
+        diff = diff_schedules(old, new, dt_util.now().date())
+        if not diff:
+            return
+
+        _LOGGER.debug(
+            "Schedule changed for %s: %d added, %d removed, %d changed",
+            self.config_entry.entry_id,
+            len(diff.added),
+            len(diff.removed),
+            len(diff.changed),
+        )
+        self.hass.bus.async_fire(
+            SCHEDULE_CHANGED,
+            {
+                "entry_id": self.config_entry.entry_id,
+                "added": [_event_dict(event) for event in diff.added],
+                "removed": [_event_dict(event) for event in diff.removed],
+                "changed": [
+                    {
+                        "date": new_event.date.isoformat(),
+                        "old_bins": list(old_event.bins),
+                        "new_bins": list(new_event.bins),
+                    }
+                    for old_event, new_event in diff.changed
+                ],
+            },
+        )
@@ -2,15 +2,23 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, TypedDict
 
 if TYPE_CHECKING:
+    from aiohttp import CookieJar
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
 
     from .api import GreyhoundApiClient
+    from .cache import DataCache
     from .coordinator import GreyhoundDataUpdateCoordinator
+    from .metrics import LatencyHistogram
+    from .profiler import RefreshProfiler
+    from .schedule import ScheduleCache
+    from .timeouts import AdaptiveTimeouts
+    from .tracing import RefreshTracer
 
 # Typed ConfigEntry with attached runtime data
 type GreyhoundConfigEntry = ConfigEntry[GreyhoundData]
@@ -23,3 +31,49 @@ class GreyhoundData:
     client: GreyhoundApiClient
     coordinator: GreyhoundDataUpdateCoordinator
     integration: Integration
+
+
+@dataclass
+class GreyhoundDomainData:
+    """Integration-wide data shared by all greyhound_bin config entries."""
+
+    profiler: RefreshProfiler
+    schedule_cache: ScheduleCache
+    refresh_latency: LatencyHistogram
+    tracer: RefreshTracer
+    timeouts: AdaptiveTimeouts
+    # Limits entries doing their first refresh at once, e.g. after a bulk import
+    first_refresh_slots: asyncio.Semaphore
+    data_cache: DataCache
+    # Sessions logged in by import_accounts, taken over by the entry's setup
+    login_jars: dict[str, CookieJar] = field(default_factory=dict)
+
+
+class ScheduleChangedData(TypedDict):
+    """Event data fired when an account's collection schedule changes."""
+
+    entry_id: str
+    added: list[dict[str, str | list[str]]]
+    removed: list[dict[str, str | list[str]]]
+    changed: list[dict[str, str | list[str]]]
+
+
+class ReminderData(TypedDict):
+    """Event data fired when a collection reminder is due."""
+
+    entry_id: str
+    date: str
+    bins: list[str]
+    offset_hours: float
+
+
+class ProfileFinishedData(TypedDict):
+    """Event data fired when a profiling session has been written."""
+
+    entry_id: str | None
+    profile_file: str
+    allocations_file: str
+    refreshes: int
+    duration: float
+    top_functions: list[dict[str, Any]]
+    top_allocations: list[dict[str, Any]]
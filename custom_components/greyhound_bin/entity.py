@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -25,3 +29,14 @@ class GreyhoundBinEntity(CoordinatorEntity[GreyhoundDataUpdateCoordinator]):
             name="Greyhound Bin",  # This is what shows up as the device name
             manufacturer="Greyhound",
         )
+
+
+@callback
+def async_remove_stale_entities(
+    hass: HomeAssistant, entry: ConfigEntry, platform: Platform, keep: set[str]
+) -> None:
+    """Drop registry entries of a platform the entry no longer creates."""
+    registry = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if entity_entry.domain == platform and entity_entry.unique_id not in keep:
+            registry.async_remove(entity_entry.entity_id)
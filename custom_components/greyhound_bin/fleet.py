@@ -0,0 +1,368 @@
+"""Headless fleet fetcher for greyhound_bin accounts.
+
+Fetches the collection schedule of many accounts without a running Home
+Assistant instance, for pre-warming and auditing::
+
+    python -m custom_components.greyhound_bin.fleet accounts.csv -o out.jsonl
+
+The credentials file is a CSV with ``account number`` and ``pin`` columns, or
+JSON Lines with the same keys. Results stream to JSON Lines, or to SQLite when
+the output ends in ``.db``/``.sqlite``. Accounts already fetched successfully
+are skipped, so an interrupted run can simply be started again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+import csv
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+import json
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import sys
+import time
+from typing import Any
+
+from aiohttp import ClientSession, CookieJar, TCPConnector
+
+from .api import GreyhoundApiClient, parse_schedule_payload
+from .const import (
+    CONF_ACCNO,
+    CONF_PIN,
+    FLEET_COMMIT_EVERY,
+    FLEET_CONCURRENCY,
+    FLEET_PROGRESS_INTERVAL,
+)
+from .schedule import ScheduleCache
+from .timeouts import AdaptiveTimeouts
+
+_LOGGER = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+def read_credentials(path: Path) -> list[tuple[str, str]]:
+    """Read unique (account number, pin) pairs from a CSV or JSON Lines file."""
+    with path.open(newline="", encoding="utf-8") as handle:
+        if path.suffix in (".jsonl", ".ndjson"):
+            rows: Any = (json.loads(line) for line in handle if line.strip())
+        else:
+            rows = csv.DictReader(handle)
+        credentials = {
+            str(row[CONF_ACCNO]).strip(): str(row[CONF_PIN]).strip() for row in rows
+        }
+    return list(credentials.items())
+
+
+def parse_collection_days(payload: str) -> list[dict[str, Any]]:
+    """Parse a raw calendar payload into plain collection days (worker side)."""
+    return [
+        {"date": event.date.isoformat(), "bins": list(event.bins)}
+        for event in parse_schedule_payload(payload).events
+    ]
+
+
+class JsonLinesSink:
+    """Append fetch results to a JSON Lines file."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the sink."""
+        self._path = path
+        self._handle: Any = None
+
+    def completed(self) -> set[str]:
+        """Return accounts whose latest record succeeded."""
+        if not self._path.exists():
+            return set()
+        status: dict[str, str] = {}
+        with self._path.open(encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Cut short by an interrupted run, that account is fetched again
+                    continue
+                status[record["account"]] = record["status"]
+        return {account for account, value in status.items() if value == STATUS_OK}
+
+    def open(self) -> None:
+        """Open the file for appending."""
+        self._handle = self._path.open("a", encoding="utf-8")
+        if self._handle.tell():
+            with self._path.open("rb") as handle:
+                handle.seek(-1, os.SEEK_END)
+                if handle.read() != b"\n":
+                    # End the line an interrupted run left half written
+                    self._handle.write("\n")
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write one record, flushed so an interrupted run keeps it."""
+        self._handle.write(json.dumps(record) + "\n")
+        self._handle.flush()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if self._handle is not None:
+            self._handle.close()
+
+
+class SqliteSink:
+    """Upsert fetch results into a SQLite table."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the sink."""
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS schedules ("
+            "account TEXT PRIMARY KEY, fetched_at TEXT, status TEXT, "
+            "error TEXT, collection_days TEXT)"
+        )
+        self._pending = 0
+
+    def completed(self) -> set[str]:
+        """Return accounts whose latest record succeeded."""
+        rows = self._conn.execute(
+            "SELECT account FROM schedules WHERE status = ?", (STATUS_OK,)
+        )
+        return {account for (account,) in rows}
+
+    def open(self) -> None:
+        """Nothing to do, the connection is opened on init."""
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write one record, committing in batches."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO schedules VALUES (?, ?, ?, ?, ?)",
+            (
+                record["account"],
+                record["fetched_at"],
+                record["status"],
+                record.get("error"),
+                json.dumps(record.get("collection_days")),
+            ),
+        )
+        self._pending += 1
+        if self._pending >= FLEET_COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        """Commit and close the connection."""
+        self._conn.commit()
+        self._conn.close()
+
+
+@dataclass
+class FleetStats:
+    """Progress and throughput counters for a fleet run."""
+
+    total: int
+    skipped: int = 0
+    ok: int = 0
+    failed: int = 0
+    bytes_received: int = 0
+    parsed: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def done(self) -> int:
+        """Return the number of accounts finished in this run."""
+        return self.ok + self.failed
+
+    def line(self) -> str:
+        """Return a one-line progress summary."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f"{self.done}/{self.total} done ({self.skipped} skipped), "
+            f"{self.ok} ok, {self.failed} failed, {self.parsed} parsed, "
+            f"{self.done / elapsed:.1f} accounts/s, "
+            f"{self.bytes_received / elapsed / 1024:.1f} KiB/s"
+        )
+
+
+class FleetFetcher:
+    """Fetch many accounts with bounded concurrency and parse in a pool."""
+
+    def __init__(
+        self,
+        connector: TCPConnector,
+        executor: Executor,
+        stats: FleetStats,
+        concurrency: int = FLEET_CONCURRENCY,
+    ) -> None:
+        """Initialize the fetcher."""
+        self._connector = connector
+        self._executor = executor
+        self._stats = stats
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # Learnt from every account, so one stuck request cannot hold a slot long
+        self._timeouts = AdaptiveTimeouts()
+        # Identical payloads are only sent to the pool once
+        self._parsed: dict[bytes, asyncio.Future[list[dict[str, Any]]]] = {}
+
+    async def _async_fetch_payload(self, account: str, pin: str) -> str:
+        """Log in and fetch the raw payload with a per-account cookie jar."""
+        async with self._semaphore:
+            async with ClientSession(
+                connector=self._connector, connector_owner=False
+            ) as session:
+                client = GreyhoundApiClient(
+                    account, pin, session, timeouts=self._timeouts
+                )
+                return await client.async_get_payload()
+
+    def _parse(self, payload: str) -> asyncio.Future[list[dict[str, Any]]]:
+        """Return the (possibly shared) parse future for a payload."""
+        key = ScheduleCache.key(payload)
+        future = self._parsed.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._parsed[key] = loop.run_in_executor(
+                self._executor, parse_collection_days, payload
+            )
+            self._stats.parsed += 1
+        return future
+
+    async def async_fetch(self, account: str, pin: str) -> dict[str, Any]:
+        """Fetch and parse one account, returning its output record."""
+        record: dict[str, Any] = {"account": account}
+        try:
+            payload = await self._async_fetch_payload(account, pin)
+            self._stats.bytes_received += len(payload)
+            record["collection_days"] = await self._parse(payload)
+        except Exception as err:  # noqa: BLE001 keep the fleet running
+            _LOGGER.debug("Fetching %s failed: %s", account, err)
+            record["status"] = STATUS_ERROR
+            record["error"] = f"{type(err).__name__}: {err}"
+            self._stats.failed += 1
+        else:
+            record["status"] = STATUS_OK
+            self._stats.ok += 1
+        record["fetched_at"] = datetime.now(UTC).isoformat()
+        return record
+
+
+async def async_validate_credentials(
+    credentials: list[tuple[str, str]],
+    concurrency: int = FLEET_CONCURRENCY,
+    cookie_jars: dict[str, CookieJar] | None = None,
+) -> dict[str, str | None]:
+    """Log in to every account concurrently and return each one's error.
+
+    Every login gets its own cookie jar over one shared connector, so
+    concurrent logins cannot overwrite each other's session. The jars of
+    the valid accounts are added to cookie_jars when given, so a caller can
+    keep using those sessions instead of logging in again.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    timeouts = AdaptiveTimeouts()
+
+    async def _async_validate(account: str, pin: str) -> str | None:
+        jar = CookieJar()
+        async with semaphore:
+            async with ClientSession(
+                connector=connector, connector_owner=False, cookie_jar=jar
+            ) as session:
+                try:
+                    await GreyhoundApiClient(
+                        account, pin, session, timeouts=timeouts
+                    ).login()
+                except Exception as err:  # noqa: BLE001 reported per account
+                    return f"{type(err).__name__}: {err}"
+        if cookie_jars is not None:
+            cookie_jars[account] = jar
+        return None
+
+    connector = TCPConnector(limit=concurrency)
+    try:
+        errors = await asyncio.gather(
+            *(_async_validate(account, pin) for account, pin in credentials)
+        )
+    finally:
+        await connector.close()
+    return {account: error for (account, _), error in zip(credentials, errors)}
+
+
+async def _async_report_progress(stats: FleetStats, interval: float) -> None:
+    """Print progress to stderr until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        print(stats.line(), file=sys.stderr, flush=True)
+
+
+async def async_run(args: argparse.Namespace) -> int:
+    """Run the fleet fetch and return the process exit code."""
+    credentials = read_credentials(args.credentials)
+    sink: JsonLinesSink | SqliteSink = (
+        SqliteSink(args.output)
+        if args.output.suffix in (".db", ".sqlite", ".sqlite3")
+        else JsonLinesSink(args.output)
+    )
+    completed = sink.completed()
+    pending = [(acc, pin) for acc, pin in credentials if acc not in completed]
+    stats = FleetStats(total=len(pending), skipped=len(credentials) - len(pending))
+
+    sink.open()
+    connector = TCPConnector(limit=args.concurrency)
+    progress = asyncio.create_task(_async_report_progress(stats, args.progress))
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            fetcher = FleetFetcher(connector, executor, stats, args.concurrency)
+            tasks = [
+                asyncio.create_task(fetcher.async_fetch(account, pin))
+                for account, pin in pending
+            ]
+            for next_record in asyncio.as_completed(tasks):
+                sink.write(await next_record)
+    finally:
+        progress.cancel()
+        await connector.close()
+        sink.close()
+
+    print(stats.line(), file=sys.stderr, flush=True)
+    return 1 if stats.failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.greyhound_bin.fleet",
+        description="Fetch Greyhound bin schedules for many accounts.",
+    )
+    parser.add_argument("credentials", type=Path, help="CSV or JSON Lines file")
+    parser.add_argument(
+        "-o", "--output", type=Path, required=True, help=".jsonl or .db output"
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=FLEET_CONCURRENCY,
+        help="concurrent logins and calendar fetches",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="parser processes"
+    )
+    parser.add_argument(
+        "--progress",
+        type=float,
+        default=FLEET_PROGRESS_INTERVAL,
+        help="seconds between progress lines",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    return asyncio.run(async_run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Home Assistant setup of the greyhound_bin integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import CookieJar
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.discovery import async_load_platform
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.loader import async_get_loaded_integration
+import voluptuous as vol
+
+from .api import GreyhoundApiClient
+from .cache import DataCache
+from .const import (
+    CACHE_SAVE_DELAY,
+    CACHE_STORAGE_KEY,
+    CACHE_STORAGE_VERSION,
+    CACHE_SWEEP_MINUTES,
+    CONF_ACCNO,
+    CONF_AGGREGATE_CALENDAR,
+    CONF_CACHE_SIZE_KIB,
+    CONF_CACHE_TTL_HOURS,
+    CONF_LAZY_REFRESH,
+    CONF_PIN,
+    CONF_REMINDER_OFFSETS,
+    CONF_SERVICE_NOTICES,
+    DEFAULT_CACHE_SIZE_KIB,
+    DEFAULT_CACHE_TTL_HOURS,
+    DOMAIN,
+    FIRST_REFRESH_CONCURRENCY,
+    LOGGER,
+    TRACE_LOG_FILE,
+    UPDATE_INTERVAL_HOURS,
+)
+from .coordinator import GreyhoundDataUpdateCoordinator
+from .data import GreyhoundData, GreyhoundDomainData
+from .metrics import GreyhoundMetricsView, LatencyHistogram
+from .profiler import RefreshProfiler
+from .reminders import ReminderScheduler
+from .schedule import ScheduleCache
+from .services import async_setup_services
+from .statistics import GreyhoundStatistics
+from .timeouts import AdaptiveTimeouts
+from .tracing import RefreshTracer, TraceLogWriter
+from .websocket import async_setup_websocket
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.typing import ConfigType
+
+    from .data import GreyhoundConfigEntry
+
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CALENDAR]
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                vol.Optional(
+                    CONF_CACHE_SIZE_KIB, default=DEFAULT_CACHE_SIZE_KIB
+                ): vol.All(vol.Coerce(int), vol.Range(min=64)),
+                vol.Optional(
+                    CONF_CACHE_TTL_HOURS, default=DEFAULT_CACHE_TTL_HOURS
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.25)),
+                vol.Optional(CONF_AGGREGATE_CALENDAR, default=False): cv.boolean,
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration-wide data and services."""
+    conf = config.get(DOMAIN, {})
+    trace_log = TraceLogWriter(Path(hass.config.path(TRACE_LOG_FILE)))
+    schedule_cache = ScheduleCache()
+    store: Store[dict[str, Any]] = Store(hass, CACHE_STORAGE_VERSION, CACHE_STORAGE_KEY)
+    data_cache = DataCache(
+        max_bytes=conf.get(CONF_CACHE_SIZE_KIB, DEFAULT_CACHE_SIZE_KIB) * 1024,
+        ttl=timedelta(
+            hours=conf.get(CONF_CACHE_TTL_HOURS, DEFAULT_CACHE_TTL_HOURS)
+        ).total_seconds(),
+        schedule_cache=schedule_cache,
+        persist=lambda: store.async_delay_save(data_cache.snapshot, CACHE_SAVE_DELAY),
+    )
+    stored = await store.async_load() or {}
+    data_cache.restore(
+        {
+            entry_id: item
+            for entry_id, item in stored.items()
+            if hass.config_entries.async_get_entry(entry_id)
+        }
+    )
+
+    @callback
+    def _async_evict_expired(now: datetime) -> None:
+        data_cache.evict_expired()
+
+    async_track_time_interval(
+        hass,
+        _async_evict_expired,
+        timedelta(minutes=CACHE_SWEEP_MINUTES),
+        cancel_on_shutdown=True,
+    )
+
+    hass.data[DOMAIN] = GreyhoundDomainData(
+        profiler=RefreshProfiler(),
+        schedule_cache=schedule_cache,
+        refresh_latency=LatencyHistogram(),
+        tracer=RefreshTracer(
+            lambda trace: hass.async_add_executor_job(trace_log.write, trace)
+        ),
+        timeouts=AdaptiveTimeouts(),
+        first_refresh_slots=asyncio.Semaphore(FIRST_REFRESH_CONCURRENCY),
+        data_cache=data_cache,
+    )
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    hass.http.register_view(GreyhoundMetricsView())
+    if conf.get(CONF_AGGREGATE_CALENDAR):
+        # One calendar for the whole integration, not owned by any entry
+        hass.async_create_task(
+            async_load_platform(hass, Platform.CALENDAR, DOMAIN, {}, config)
+        )
+    return True
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: GreyhoundConfigEntry) -> bool:
+    """Set up Greyhound Bin from a config entry."""
+
+    coordinator = GreyhoundDataUpdateCoordinator(
+        hass=hass,
+        logger=LOGGER,
+        name=DOMAIN,
+        update_interval=(
+            None
+            if entry.options.get(CONF_LAZY_REFRESH)
+            else timedelta(hours=UPDATE_INTERVAL_HOURS)
+        ),
+    )
+    # An imported account keeps the session its validation logged in
+    login_jar = hass.data[DOMAIN].login_jars.pop(entry.data[CONF_ACCNO], None)
+    client = GreyhoundApiClient(
+        accountnumber=entry.data[CONF_ACCNO],
+        pin=entry.data[CONF_PIN],
+        # Own cookie jar, a shared one mixes the accounts' sessionid cookies.
+        # Closed with the entry when it unloads.
+        session=async_create_clientsession(hass, cookie_jar=login_jar or CookieJar()),
+        schedule_cache=hass.data[DOMAIN].schedule_cache,
+        timeouts=hass.data[DOMAIN].timeouts,
+        notices=entry.options.get(CONF_SERVICE_NOTICES, False),
+    )
+    # If that session expired, the failed fetch logs in again on the retry
+    client.logged_in = login_jar is not None
+    entry.runtime_data = GreyhoundData(
+        client=client,
+        coordinator=coordinator,
+        integration=async_get_loaded_integration(hass, entry.domain),
+    )
+
+    # A lazy entry starts from its stored data and refreshes when first read
+    if not coordinator.async_restore():
+        try:
+            async with hass.data[DOMAIN].first_refresh_slots:
+                await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryAuthFailed as err:
+            raise ConfigEntryAuthFailed(f"Auth failed during setup: {err}") from err
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(
+        ReminderScheduler(
+            hass, coordinator, entry.options.get(CONF_REMINDER_OFFSETS, {})
+        ).async_start()
+    )
+    if "recorder" in hass.config.components:
+        entry.async_on_unload(
+            await GreyhoundStatistics(hass, coordinator).async_start()
+        )
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    return True
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: GreyhoundConfigEntry) -> bool:
+    """Unload a config entry."""
+    if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        hass.data[DOMAIN].data_cache.evict(entry.entry_id)
+    return unloaded
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: GreyhoundConfigEntry) -> None:
+    """Drop the stored data of a removed config entry."""
+    if DOMAIN in hass.data:
+        hass.data[DOMAIN].data_cache.remove(entry.entry_id)
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: GreyhoundConfigEntry) -> None:
+    """Reload a config entry."""
+    await hass.config_entries.async_reload(entry.entry_id)
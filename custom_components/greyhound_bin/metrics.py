@@ -0,0 +1,339 @@
+"""OpenMetrics endpoint for greyhound_bin refreshes."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+import time
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.helpers.http import KEY_HASS
+
+from .const import DOMAIN, METRICS_LATENCY_BUCKETS, METRICS_URL
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .cache import DataCache
+    from .schedule import ScheduleCache
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+@dataclass(slots=True)
+class RefreshMetrics:
+    """Per-entry refresh counters.
+
+    Only ever touched from the event loop, so plain attributes are enough.
+    """
+
+    refreshes: int = 0
+    failures: dict[str, int] = field(default_factory=dict)
+    last_duration: float | None = None
+    last_attempt: float | None = None
+    last_success: float | None = None
+    prediction_checks: int = 0
+    prediction_errors: int = 0
+    last_prediction_error: int | None = None
+    predicted_refreshes: int = 0
+    lazy_refreshes: int = 0
+
+    def observe(self, duration: float, error: BaseException | None = None) -> None:
+        """Record a finished refresh."""
+        now = time.time()
+        self.refreshes += 1
+        self.last_duration = duration
+        self.last_attempt = now
+        if error is None:
+            self.last_success = now
+        else:
+            name = type(error).__name__
+            self.failures[name] = self.failures.get(name, 0) + 1
+
+    def observe_prediction(self, error: int) -> None:
+        """Record how many predicted days a fetch corrected."""
+        self.prediction_checks += 1
+        self.prediction_errors += error
+        self.last_prediction_error = error
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram shared by all entries."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = METRICS_LATENCY_BUCKETS) -> None:
+        """Initialize the histogram."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+@dataclass(slots=True)
+class EntrySample:
+    """Point-in-time view of one entry, gathered when scraped."""
+
+    entry_id: str
+    metrics: RefreshMetrics
+    logins: int
+    bytes_received: int
+    update_interval: float | None
+    cached_bytes: int = 0
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    """Format a label set."""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def render_openmetrics(
+    samples: Iterable[EntrySample],
+    histogram: LatencyHistogram,
+    cache: ScheduleCache,
+    data_cache: DataCache,
+    now: float,
+) -> str:
+    """Render all metrics in the OpenMetrics text format."""
+    samples = list(samples)
+    lines: list[str] = []
+
+    def family(name: str, kind: str, help_text: str, unit: str = "") -> None:
+        lines.append(f"# TYPE {name} {kind}")
+        if unit:
+            lines.append(f"# UNIT {name} {unit}")
+        lines.append(f"# HELP {name} {help_text}")
+
+    prefix = DOMAIN
+    family(f"{prefix}_entries", "gauge", "Loaded config entries.")
+    lines.append(f"{prefix}_entries {len(samples)}")
+
+    family(f"{prefix}_refreshes", "counter", "Coordinator refreshes.")
+    for sample in samples:
+        labels = _labels(entry_id=sample.entry_id)
+        lines.append(f"{prefix}_refreshes_total{labels} {sample.metrics.refreshes}")
+
+    family(f"{prefix}_refresh_failures", "counter", "Failed refreshes by error.")
+    for sample in samples:
+        for error, count in sorted(sample.metrics.failures.items()):
+            labels = _labels(entry_id=sample.entry_id, error=error)
+            lines.append(f"{prefix}_refresh_failures_total{labels} {count}")
+
+    family(f"{prefix}_logins", "counter", "Login attempts.")
+    for sample in samples:
+        labels = _labels(entry_id=sample.entry_id)
+        lines.append(f"{prefix}_logins_total{labels} {sample.logins}")
+
+    family(f"{prefix}_received_bytes", "counter", "Response bytes.", "bytes")
+    for sample in samples:
+        labels = _labels(entry_id=sample.entry_id)
+        lines.append(f"{prefix}_received_bytes_total{labels} {sample.bytes_received}")
+
+    family(
+        f"{prefix}_last_refresh_duration_seconds",
+        "gauge",
+        "Duration of the last refresh.",
+        "seconds",
+    )
+    for sample in samples:
+        if sample.metrics.last_duration is not None:
+            labels = _labels(entry_id=sample.entry_id)
+            lines.append(
+                f"{prefix}_last_refresh_duration_seconds{labels} "
+                f"{sample.metrics.last_duration:.6f}"
+            )
+
+    family(
+        f"{prefix}_data_age_seconds",
+        "gauge",
+        "Seconds since the last successful refresh.",
+        "seconds",
+    )
+    for sample in samples:
+        if sample.metrics.last_success is not None:
+            labels = _labels(entry_id=sample.entry_id)
+            age = now - sample.metrics.last_success
+            lines.append(f"{prefix}_data_age_seconds{labels} {age:.3f}")
+
+    family(
+        f"{prefix}_next_refresh_timestamp_seconds",
+        "gauge",
+        "Unix time of the next scheduled refresh.",
+        "seconds",
+    )
+    for sample in samples:
+        if sample.metrics.last_attempt is not None and sample.update_interval:
+            labels = _labels(entry_id=sample.entry_id)
+            next_refresh = sample.metrics.last_attempt + sample.update_interval
+            lines.append(
+                f"{prefix}_next_refresh_timestamp_seconds{labels} {next_refresh:.3f}"
+            )
+
+    family(f"{prefix}_prediction_checks", "counter", "Predictions checked.")
+    for sample in samples:
+        labels = _labels(entry_id=sample.entry_id)
+        lines.append(
+            f"{prefix}_prediction_checks_total{labels} "
+            f"{sample.metrics.prediction_checks}"
+        )
+
+    family(
+        f"{prefix}_prediction_corrected_days",
+        "counter",
+        "Predicted days the portal contradicted.",
+    )
+    for sample in samples:
+        labels = _labels(entry_id=sample.entry_id)
+        lines.append(
+            f"{prefix}_prediction_corrected_days_total{labels} "
+            f"{sample.metrics.prediction_errors}"
+        )
+
+    family(
+        f"{prefix}_last_prediction_corrected_days",
+        "gauge",
+        "Days corrected by the last prediction check.",
+    )
+    for sample in samples:
+        if sample.metrics.last_prediction_error is not None:
+            labels = _labels(entry_id=sample.entry_id)
+            lines.append(
+                f"{prefix}_last_prediction_corrected_days{labels} "
+                f"{sample.metrics.last_prediction_error}"
+            )
+
+    family(
+        f"{prefix}_predicted_refreshes",
+        "counter",
+        "Failed refreshes served from the predicted schedule.",
+    )
+    for sample in samples:
+        labels = _labels(entry_id=sample.entry_id)
+        lines.append(
+            f"{prefix}_predicted_refreshes_total{labels} "
+            f"{sample.metrics.predicted_refreshes}"
+        )
+
+    family(
+        f"{prefix}_lazy_refreshes",
+        "counter",
+        "Refreshes started by reading stale data.",
+    )
+    for sample in samples:
+        labels = _labels(entry_id=sample.entry_id)
+        lines.append(
+            f"{prefix}_lazy_refreshes_total{labels} {sample.metrics.lazy_refreshes}"
+        )
+
+    name = f"{prefix}_refresh_duration_seconds"
+    family(name, "histogram", "Refresh latency of all entries.", "seconds")
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_count {histogram.count}")
+    lines.append(f"{name}_sum {histogram.sum:.6f}")
+
+    family(f"{prefix}_schedule_cache_hits", "counter", "Shared parse cache hits.")
+    lines.append(f"{prefix}_schedule_cache_hits_total {cache.hits}")
+    family(f"{prefix}_schedule_cache_misses", "counter", "Shared parse cache misses.")
+    lines.append(f"{prefix}_schedule_cache_misses_total {cache.misses}")
+    family(f"{prefix}_schedule_cache_entries", "gauge", "Cached parsed schedules.")
+    lines.append(f"{prefix}_schedule_cache_entries {len(cache)}")
+
+    family(
+        f"{prefix}_data_cache_entry_bytes",
+        "gauge",
+        "Approximate bytes cached for an entry.",
+        "bytes",
+    )
+    for sample in samples:
+        labels = _labels(entry_id=sample.entry_id)
+        lines.append(f"{prefix}_data_cache_entry_bytes{labels} {sample.cached_bytes}")
+    family(
+        f"{prefix}_data_cache_bytes",
+        "gauge",
+        "Approximate bytes cached for all entries.",
+        "bytes",
+    )
+    lines.append(f"{prefix}_data_cache_bytes {data_cache.bytes}")
+    family(f"{prefix}_data_cache_limit_bytes", "gauge", "Data cache budget.", "bytes")
+    lines.append(f"{prefix}_data_cache_limit_bytes {data_cache.max_bytes}")
+    family(
+        f"{prefix}_data_cache_resident_entries",
+        "gauge",
+        "Entries with parsed data in memory.",
+    )
+    lines.append(f"{prefix}_data_cache_resident_entries {data_cache.resident}")
+    family(
+        f"{prefix}_data_cache_evictions",
+        "counter",
+        "Parsed entry data dropped, by reason.",
+    )
+    for reason, count in sorted(data_cache.evictions.items()):
+        labels = _labels(reason=reason)
+        lines.append(f"{prefix}_data_cache_evictions_total{labels} {count}")
+    family(
+        f"{prefix}_data_cache_rebuilds",
+        "counter",
+        "Evicted entry data rebuilt from its compact form.",
+    )
+    lines.append(f"{prefix}_data_cache_rebuilds_total {data_cache.rebuilds}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class GreyhoundMetricsView(HomeAssistantView):
+    """Serve refresh metrics for scrape-based monitoring."""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Render the metrics for all loaded entries."""
+        hass = request.app[KEY_HASS]
+        domain_data = hass.data[DOMAIN]
+        samples = []
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            if entry.state is not ConfigEntryState.LOADED:
+                continue
+            coordinator = entry.runtime_data.coordinator
+            client = entry.runtime_data.client
+            interval = coordinator.update_interval
+            samples.append(
+                EntrySample(
+                    entry_id=entry.entry_id,
+                    metrics=coordinator.metrics,
+                    logins=client.logins,
+                    bytes_received=client.bytes_received,
+                    update_interval=interval.total_seconds() if interval else None,
+                    cached_bytes=domain_data.data_cache.entry_bytes(entry.entry_id),
+                )
+            )
+
+        body = render_openmetrics(
+            samples,
+            domain_data.refresh_latency,
+            domain_data.schedule_cache,
+            domain_data.data_cache,
+            time.time(),
+        )
+        return web.Response(body=body.encode(), headers={"Content-Type": CONTENT_TYPE})
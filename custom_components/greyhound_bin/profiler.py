@@ -0,0 +1,165 @@
+"""On-demand profiling of coordinator refreshes."""
+
+from __future__ import annotations
+
+import cProfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import pstats
+import tracemalloc
+from typing import Any, Callable, Iterator
+
+from .const import LOGGER, PROFILE_TOP_FUNCTIONS, PROFILE_TRACEMALLOC_FRAMES
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profiling session is already running."""
+
+
+@dataclass
+class ProfileSession:
+    """A single profiling session covering one or more refreshes."""
+
+    entry_id: str | None
+    target: int | None = None
+    on_done: Callable[[], None] | None = None
+    profile: cProfile.Profile = field(default_factory=cProfile.Profile)
+    refreshes: int = 0
+    started_tracemalloc: bool = False
+    _active: int = 0
+    _enabled: bool = False
+
+
+class RefreshProfiler:
+    """Profile coordinator refreshes while a session is armed.
+
+    cProfile hooks the event loop thread, so while a refresh is being
+    tracked anything else the loop runs in between awaits is recorded too.
+    Overlapping refreshes share the same enable/disable window.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self._session: ProfileSession | None = None
+
+    @property
+    def active(self) -> bool:
+        """Return True if a session is armed."""
+        return self._session is not None
+
+    def start(
+        self,
+        entry_id: str | None = None,
+        target: int | None = None,
+        on_done: Callable[[], None] | None = None,
+    ) -> ProfileSession:
+        """Arm a new session, optionally limited to one config entry.
+
+        on_done is called once target refreshes have been tracked.
+        """
+        if self._session is not None:
+            raise ProfilerBusyError("A profiling session is already running.")
+
+        session = ProfileSession(entry_id=entry_id, target=target, on_done=on_done)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+            session.started_tracemalloc = True
+
+        self._session = session
+        return session
+
+    def stop(self) -> tuple[ProfileSession, tracemalloc.Snapshot]:
+        """Disarm the running session and take the allocation snapshot."""
+        session = self._session
+        if session is None:
+            raise ProfilerBusyError("No profiling session is running.")
+        self._session = None
+
+        if session._enabled:
+            session.profile.disable()
+            session._enabled = False
+
+        snapshot = tracemalloc.take_snapshot()
+        if session.started_tracemalloc:
+            tracemalloc.stop()
+
+        return session, snapshot
+
+    @contextmanager
+    def track(self, entry_id: str) -> Iterator[None]:
+        """Profile the wrapped refresh if a matching session is armed."""
+        session = self._session
+        if session is None or session.entry_id not in (None, entry_id):
+            yield
+            return
+
+        if session._active == 0 and not session._enabled:
+            try:
+                session.profile.enable()
+            except ValueError:
+                LOGGER.warning("Another profiler is active, skipping refresh")
+                yield
+                return
+            session._enabled = True
+
+        session._active += 1
+        try:
+            yield
+        finally:
+            session._active -= 1
+            session.refreshes += 1
+            if session._active == 0 and session._enabled:
+                session.profile.disable()
+                session._enabled = False
+            if session.on_done is not None and session.refreshes == session.target:
+                session.on_done()
+
+
+def summarize_profile(
+    profile: cProfile.Profile, limit: int = PROFILE_TOP_FUNCTIONS
+) -> list[dict[str, Any]]:
+    """Return the functions with the highest cumulative time."""
+    profile.create_stats()
+    rows = sorted(
+        profile.stats.items(),  # type: ignore[attr-defined]
+        key=lambda item: item[1][3],
+        reverse=True,
+    )[:limit]
+
+    return [
+        {
+            "function": pstats.func_std_string(func),
+            "calls": ncalls,
+            "total_time": round(tottime, 6),
+            "cumulative_time": round(cumtime, 6),
+        }
+        for func, (_, ncalls, tottime, cumtime, _) in rows
+    ]
+
+
+def summarize_snapshot(
+    snapshot: tracemalloc.Snapshot, limit: int = PROFILE_TOP_FUNCTIONS
+) -> list[dict[str, Any]]:
+    """Return the source lines holding the most allocated memory."""
+    snapshot = snapshot.filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+    return [
+        {
+            "location": str(stat.traceback),
+            "size_kib": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def write_results(
+    session: ProfileSession,
+    snapshot: tracemalloc.Snapshot,
+    profile_path: str,
+    snapshot_path: str,
+) -> None:
+    """Write the profile and allocation snapshot to disk (blocking)."""
+    session.profile.dump_stats(profile_path)
+    snapshot.dump(snapshot_path)
@@ -0,0 +1,114 @@
+"""Infer and extrapolate an account's collection recurrence."""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import pairwise
+
+from .const import (
+    RECURRENCE_MAX_CYCLE,
+    RECURRENCE_MIN_CONFIDENCE,
+    RECURRENCE_MIN_EVENTS,
+)
+from .schedule import CollectionEvent, Schedule, intern_event
+
+
+@dataclass(frozen=True, slots=True)
+class Recurrence:
+    """A fixed collection period with a repeating cycle of bin sets.
+
+    Step ``k`` after ``anchor`` falls on ``anchor + k * period_days`` and
+    collects ``cycle[k % len(cycle)]``; ``cycle[0]`` is the anchor's bins.
+    """
+
+    anchor: date
+    period_days: int
+    cycle: tuple[tuple[str, ...], ...]
+
+    @property
+    def weekday(self) -> int:
+        """Return the collection weekday (Monday is 0)."""
+        return self.anchor.weekday()
+
+    def predict(self, start: date, end: date) -> tuple[CollectionEvent, ...]:
+        """Return predicted collections after the anchor from start to end."""
+        step = max(1, -(-(start - self.anchor).days // self.period_days))
+        events = []
+        while (day := self.anchor + timedelta(days=step * self.period_days)) <= end:
+            events.append(intern_event(day, self.cycle[step % len(self.cycle)]))
+            step += 1
+        return tuple(events)
+
+    def extend(self, schedule: Schedule, end: date) -> tuple[CollectionEvent, ...]:
+        """Return predicted collections after the last known date up to end."""
+        if not schedule.events:
+            return ()
+        return self.predict(schedule.events[-1].date + timedelta(days=1), end)
+
+
+def _share(matches: int, total: int) -> float:
+    """Return matches / total, treating an empty total as no evidence."""
+    return matches / total if total else 0.0
+
+
+def infer_recurrence(schedule: Schedule) -> Recurrence | None:
+    """Learn the period, weekday and bin alternation of a schedule.
+
+    Returns None unless enough collections agree on the same gap and the bin
+    sets repeat with a short cycle, so one-off holiday moves are tolerated
+    but irregular schedules are never extrapolated.
+    """
+    events = [event for event in schedule.events if event.bins]
+    if len(events) < RECURRENCE_MIN_EVENTS:
+        return None
+
+    gaps = [(later.date - earlier.date).days for earlier, later in pairwise(events)]
+    period, hits = Counter(gaps).most_common(1)[0]
+    if period <= 0 or _share(hits, len(gaps)) < RECURRENCE_MIN_CONFIDENCE:
+        return None
+
+    bins = [event.bins for event in events]
+    for length in range(1, min(RECURRENCE_MAX_CYCLE, len(bins) - 1) + 1):
+        repeats = sum(bins[i] == bins[i + length] for i in range(len(bins) - length))
+        if _share(repeats, len(bins) - length) >= RECURRENCE_MIN_CONFIDENCE:
+            break
+    else:
+        return None
+
+    # Anchor on the last collection that fell on the usual weekday, so a
+    # holiday-shifted final collection does not skew every prediction
+    weekday = Counter(event.date.weekday() for event in events).most_common(1)[0][0]
+    index = max(i for i, event in enumerate(events) if event.date.weekday() == weekday)
+    if index < length - 1:
+        return None
+
+    return Recurrence(
+        anchor=events[index].date,
+        period_days=period,
+        cycle=tuple(bins[index - ((length - step) % length)] for step in range(length)),
+    )
+
+
+def prediction_error(
+    recurrence: Recurrence, previous: Schedule, current: Schedule
+) -> int | None:
+    """Count predicted days the portal has since contradicted.
+
+    Only dates the previous fetch did not cover are checked. Returns None
+    when the new fetch revealed no such dates.
+    """
+    if not previous.events or not current.events:
+        return None
+    start = previous.events[-1].date + timedelta(days=1)
+    end = current.events[-1].date
+    if end < start:
+        return None
+
+    predicted = {event.date: event.bins for event in recurrence.predict(start, end)}
+    actual = {event.date: event.bins for event in current.between(start, end)}
+    return sum(
+        predicted.get(day) != actual.get(day)
+        for day in predicted.keys() | actual.keys()
+    )
@@ -0,0 +1,138 @@
+"""Timer-driven collection reminders for greyhound_bin."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+from weakref import ref
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+from homeassistant.util.event_type import EventType
+
+from .const import EVENT_REMINDER, LOGGER
+from .data import ReminderData
+
+if TYPE_CHECKING:
+    from .coordinator import GreyhoundDataUpdateCoordinator
+    from .schedule import Schedule
+
+REMINDER: EventType[ReminderData] = EventType(EVENT_REMINDER)
+
+
+def build_reminders(
+    entry_id: str, schedule: Schedule, offsets: dict[str, float], now: datetime
+) -> list[tuple[datetime, ReminderData]]:
+    """Return future reminders, one per collection day and offset, by time."""
+    reminders: list[tuple[datetime, ReminderData]] = []
+    for event in schedule.events:
+        day_start = dt_util.start_of_local_day(event.date)
+        by_offset: dict[float, list[str]] = {}
+        for bin_type in event.bins:
+            if offset := offsets.get(bin_type):
+                by_offset.setdefault(offset, []).append(bin_type)
+
+        for offset, bins in by_offset.items():
+            when = dt_util.as_utc(day_start - timedelta(hours=offset))
+            if when > now:
+                reminders.append(
+                    (
+                        when,
+                        {
+                            "entry_id": entry_id,
+                            "date": event.date.isoformat(),
+                            "bins": bins,
+                            "offset_hours": offset,
+                        },
+                    )
+                )
+
+    reminders.sort(key=lambda reminder: reminder[0])
+    return reminders
+
+
+class ReminderScheduler:
+    """Keep a single timer armed for the next reminder of one account.
+
+    Reminders are rebuilt only when the coordinator hands over a different
+    schedule object, so unchanged refreshes cost an identity check.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: GreyhoundDataUpdateCoordinator,
+        offsets: dict[str, float],
+    ) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._entry_id = coordinator.config_entry.entry_id
+        self._offsets = {
+            bin_type: hours for bin_type, hours in offsets.items() if hours
+        }
+        # Weak, so an evicted schedule is freed; a rebuilt one is treated as new
+        self._schedule: ref[Schedule] | None = None
+        self._pending: list[tuple[datetime, ReminderData]] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start following the coordinator and return a stop callback."""
+        if not self._offsets:
+            return lambda: None
+
+        unsub_listener = self._coordinator.async_add_listener(self._async_update)
+        self._async_update()
+
+        @callback
+        def _async_stop() -> None:
+            unsub_listener()
+            self._async_cancel_timer()
+
+        return _async_stop
+
+    @callback
+    def _async_update(self) -> None:
+        """Reschedule when the coordinator's schedule object changes."""
+        # An evicted schedule is unchanged, the pending reminders still hold
+        if not (data := self._coordinator.data) or "schedule" not in data:
+            return
+        schedule = data["schedule"]
+        if self._schedule is not None and schedule is self._schedule():
+            return
+
+        self._schedule = ref(schedule)
+        self._pending = build_reminders(
+            self._entry_id, schedule, self._offsets, dt_util.utcnow()
+        )
+        self._async_cancel_timer()
+        self._async_arm_next()
+
+    @callback
+    def _async_arm_next(self) -> None:
+        """Arm the timer for the earliest pending reminder."""
+        if self._pending:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self._hass, self._async_fire, self._pending[0][0]
+            )
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        """Fire the due reminder and arm the next one."""
+        self._unsub_timer = None
+        while self._pending and self._pending[0][0] <= now:
+            _, data = self._pending.pop(0)
+            LOGGER.debug("Collection reminder for %s: %s", self._entry_id, data)
+            self._hass.bus.async_fire(REMINDER, data)
+        self._async_arm_next()
+        # Reminders read the schedule, so they also keep a lazy entry fresh
+        self._coordinator.async_touch()
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        """Cancel the armed timer, if any."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
@@ -0,0 +1,311 @@
+"""Parsed collection schedules shared between greyhound_bin accounts."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import hashlib
+import heapq
+import sys
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Iterator, Mapping
+from weakref import WeakValueDictionary
+
+from .const import BIN_DESCRIPTIONS, BIN_ORDER, LOGGER, SCHEDULE_CACHE_SIZE
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class CollectionEvent:
+    """A single collection day and the bins collected on it."""
+
+    date: date
+    bins: tuple[str, ...]
+
+
+# Intern pools so accounts on the same route share the same objects
+_BINS: dict[tuple[str, ...], tuple[str, ...]] = {}
+_EVENTS: WeakValueDictionary[tuple[date, tuple[str, ...]], CollectionEvent] = (
+    WeakValueDictionary()
+)
+
+
+def intern_bins(bins: list[str] | tuple[str, ...]) -> tuple[str, ...]:
+    """Return the shared tuple for a set of bin types."""
+    key = tuple(sys.intern(bin_type) for bin_type in bins)
+    return _BINS.setdefault(key, key)
+
+
+def intern_event(event_date: date, bins: tuple[str, ...]) -> CollectionEvent:
+    """Return the shared event for a date and bin types."""
+    key = (event_date, bins)
+    event = _EVENTS.get(key)
+    if event is None:
+        event = _EVENTS[key] = CollectionEvent(event_date, bins)
+    return event
+
+
+def build_summary(
+    events: tuple[CollectionEvent, ...], today: date
+) -> Mapping[str, Any]:
+    """Build the summary sensor data for the next collection."""
+    if not events:
+        return MappingProxyType({})
+
+    next_event = events[0]
+    days_until = (next_event.date - today).days
+    ordered_bins = sorted(next_event.bins, key=lambda b: BIN_ORDER.get(b, 999))
+
+    return MappingProxyType(
+        {
+            "next_collection_date": next_event.date.isoformat(),
+            "bin_types": ", ".join(ordered_bins),
+            "bin_types_friendly": ", ".join(
+                BIN_DESCRIPTIONS[bin_type] for bin_type in ordered_bins
+            ),
+            "days_until_collection": days_until,
+            "collection_status": (
+                "Today"
+                if days_until == 0
+                else "Tomorrow" if days_until == 1 else f"In {days_until} days"
+            ),
+        }
+    )
+
+
+class Schedule:
+    """Immutable, date-sorted collection schedule for one payload."""
+
+    __slots__ = ("events", "_dates", "_view_key", "_view", "__weakref__")
+
+    def __init__(self, events: tuple[CollectionEvent, ...]) -> None:
+        """Initialize from events sorted by date."""
+        self.events = events
+        self._dates = [event.date for event in events]
+        self._view_key: tuple[date, int] | None = None
+        self._view: tuple[tuple[CollectionEvent, ...], Mapping[str, Any]] = (
+            (),
+            MappingProxyType({}),
+        )
+
+    @classmethod
+    def from_collection_days(cls, collection_days: dict[str, Any]) -> Schedule:
+        """Parse the portal's collection_days mapping."""
+        events = []
+        for date_str, bins in collection_days.items():
+            try:
+                event_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            except ValueError:
+                LOGGER.warning("Skipping invalid date format: %s", date_str)
+                continue
+
+            waste_types = intern_bins(
+                [b["waste_types"][0] for b in bins if b.get("waste_types")]
+            )
+            events.append(intern_event(event_date, waste_types))
+
+        events.sort(key=lambda event: event.date)
+        return cls(tuple(events))
+
+    def between(self, start: date, end: date) -> tuple[CollectionEvent, ...]:
+        """Return the events from start to end, both inclusive."""
+        return self.events[
+            bisect_left(self._dates, start) : bisect_right(self._dates, end)
+        ]
+
+    def view(
+        self, today: date, horizon_days: int
+    ) -> tuple[tuple[CollectionEvent, ...], Mapping[str, Any]]:
+        """Return the upcoming events and summary, memoized per day."""
+        if self._view_key != (today, horizon_days):
+            events = self.between(today, today + timedelta(days=horizon_days))
+            self._view = (events, build_summary(events, today))
+            self._view_key = (today, horizon_days)
+        return self._view
+
+
+@dataclass(frozen=True, slots=True)
+class AccountEvent:
+    """A collection event labelled with the account it belongs to."""
+
+    event: CollectionEvent
+    account: str
+    predicted: bool = False
+
+
+def _labelled(
+    account: str, events: Iterable[CollectionEvent], predicted: bool
+) -> Iterator[AccountEvent]:
+    """Yield one account's events with its label."""
+    for event in events:
+        yield AccountEvent(event, account, predicted)
+
+
+class MergedSchedule:
+    """Date-sorted union of many accounts' sorted event streams."""
+
+    __slots__ = ("events", "_dates")
+
+    def __init__(
+        self, sources: Iterable[tuple[str, Iterable[CollectionEvent], bool]]
+    ) -> None:
+        """K-way merge (account, events, predicted) streams sorted by date."""
+        self.events = tuple(
+            heapq.merge(
+                *(_labelled(*source) for source in sources),
+                key=lambda item: item.event.date,
+            )
+        )
+        self._dates = [item.event.date for item in self.events]
+
+    def between(self, start: date, end: date) -> tuple[AccountEvent, ...]:
+        """Return the events from start to end, both inclusive."""
+        return self.events[
+            bisect_left(self._dates, start) : bisect_right(self._dates, end)
+        ]
+
+    def next_from(self, start: date) -> AccountEvent | None:
+        """Return the first event on or after start."""
+        index = bisect_left(self._dates, start)
+        return self.events[index] if index < len(self.events) else None
+
+
+class ScheduleCache:
+    """Bounded LRU of parsed schedules keyed by a hash of the raw payload."""
+
+    def __init__(self, max_size: int = SCHEDULE_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self._max_size = max_size
+        self._schedules: OrderedDict[bytes, Schedule] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached schedules."""
+        return len(self._schedules)
+
+    @staticmethod
+    def key(payload: str) -> bytes:
+        """Return the cache key for a raw payload."""
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+    def get_or_parse(self, payload: str, parse: Callable[[str], Schedule]) -> Schedule:
+        """Return the cached schedule for payload, parsing it on a miss."""
+        key = self.key(payload)
+        schedule = self._schedules.get(key)
+        if schedule is not None:
+            self._schedules.move_to_end(key)
+            self.hits += 1
+            return schedule
+
+        self.misses += 1
+        schedule = parse(payload)
+        self._schedules[key] = schedule
+        if len(self._schedules) > self._max_size:
+            self._schedules.popitem(last=False)
+        return schedule
+
+    def discard(self, schedule: Schedule) -> None:
+        """Drop a schedule no account holds any more, so it can be freed."""
+        for key, cached in self._schedules.items():
+            if cached is schedule:
+                del self._schedules[key]
+                return
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleDiff:
+    """Collection days added, removed or changed between two schedules."""
+
+    added: tuple[CollectionEvent, ...] = ()
+    removed: tuple[CollectionEvent, ...] = ()
+    changed: tuple[tuple[CollectionEvent, CollectionEvent], ...] = ()
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_schedules(old: Schedule, new: Schedule, start: date) -> ScheduleDiff:
+    """Merge two sorted schedules and return what moved from start onwards.
+
+    Only dates both schedules cover are compared, so days rolling into the
+    portal's horizon are not reported as additions.
+    """
+    if old is new or not old.events or not new.events:
+        return ScheduleDiff()
+
+    end = min(old.events[-1].date, new.events[-1].date)
+    old_events = old.between(start, end)
+    new_events = new.between(start, end)
+    added: list[CollectionEvent] = []
+    removed: list[CollectionEvent] = []
+    changed: list[tuple[CollectionEvent, CollectionEvent]] = []
+
+    i = j = 0
+    while i < len(old_events) and j < len(new_events):
+        old_event, new_event = old_events[i], new_events[j]
+        if old_event.date < new_event.date:
+            removed.append(old_event)
+            i += 1
+        elif old_event.date > new_event.date:
+            added.append(new_event)
+            j += 1
+        else:
+            if old_event.bins != new_event.bins:
+                changed.append((old_event, new_event))
+            i += 1
+            j += 1
+    removed.extend(old_events[i:])
+    added.extend(new_events[j:])
+
+    return ScheduleDiff(tuple(added), tuple(removed), tuple(changed))
+
+
+def schedule_delta(
+    old: Schedule, new: Schedule, start: date
+) -> tuple[tuple[CollectionEvent, ...], tuple[date, ...]]:
+    """Return the events to upsert and the dates to drop from start onwards.
+
+    Unlike diff_schedules every date is compared, so applying the delta to
+    the old schedule yields exactly the new one.
+    """
+    if old is new:
+        return (), ()
+
+    old_events = old.between(start, date.max)
+    new_events = new.between(start, date.max)
+    upserts: list[CollectionEvent] = []
+    removed: list[date] = []
+
+    i = j = 0
+    while i < len(old_events) and j < len(new_events):
+        old_event, new_event = old_events[i], new_events[j]
+        if old_event.date < new_event.date:
+            removed.append(old_event.date)
+            i += 1
+        elif old_event.date > new_event.date:
+            upserts.append(new_event)
+            j += 1
+        else:
+            if old_event.bins != new_event.bins:
+                upserts.append(new_event)
+            i += 1
+            j += 1
+    removed.extend(event.date for event in old_events[i:])
+    upserts.extend(new_events[j:])
+
+    return tuple(upserts), tuple(removed)
+
+
+def compact_events(events: Iterable[CollectionEvent]) -> list[list[Any]]:
+    """Return events as [ISO date, bins] pairs for compact JSON messages."""
+    return [[event.date.isoformat(), list(event.bins)] for event in events]
+
+
+def expand_events(pairs: Iterable[list[Any]]) -> tuple[CollectionEvent, ...]:
+    """Return the interned events of [ISO date, bins] pairs."""
+    return tuple(
+        intern_event(date.fromisoformat(day), intern_bins(bins)) for day, bins in pairs
+    )
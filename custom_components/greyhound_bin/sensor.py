@@ -2,18 +2,28 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
 )
+from homeassistant.const import Platform
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_change
+
+from custom_components.greyhound_bin.const import (
+    BIN_DESCRIPTIONS,
+    CONF_ENTITY_PROFILE,
+    CONF_SERVICE_NOTICES,
+    ENTITY_PROFILE_COMPACT,
+)
 
-from custom_components.greyhound_bin.const import BIN_DESCRIPTIONS
-
-from .entity import GreyhoundBinEntity
+from .entity import GreyhoundBinEntity, async_remove_stale_entities
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -21,36 +31,48 @@ if TYPE_CHECKING:
 
     from .coordinator import GreyhoundDataUpdateCoordinator
     from .data import GreyhoundConfigEntry
+    from .schedule import CollectionEvent
+
+
+@dataclass(frozen=True, kw_only=True)
+class GreyhoundSensorEntityDescription(SensorEntityDescription):
+    """Describes a Greyhound bin sensor."""
+
+    # Whether the entry's options let the data ever fill this sensor. Decided
+    # from the options and not the data, so a failed fetch never removes it.
+    exists_fn: Callable[[Mapping[str, Any]], bool] = lambda _: True
+
 
 ENTITY_DESCRIPTIONS = (
-    SensorEntityDescription(
+    GreyhoundSensorEntityDescription(
         key="next_collection_date",
         name="Next Collection Date",
         icon="mdi:calendar",
         device_class=SensorDeviceClass.DATE,
     ),
-    SensorEntityDescription(
+    GreyhoundSensorEntityDescription(
         key="bin_types",
         name="Bin Types Being Collected",
         icon="mdi:delete-empty",
     ),
-    SensorEntityDescription(
+    GreyhoundSensorEntityDescription(
         key="days_until_collection",
         name="Days Until Next Collection",
         icon="mdi:timer-sand",
         device_class=SensorDeviceClass.DURATION,
     ),
-    SensorEntityDescription(
+    GreyhoundSensorEntityDescription(
         key="collection_status",
         name="Collection Status",
         icon="mdi:calendar-check",
     ),
-    SensorEntityDescription(
+    GreyhoundSensorEntityDescription(
         key="service_disruption",
         name="Service Disruption Alert",
         icon="mdi:alert-circle",
+        exists_fn=lambda options: options.get(CONF_SERVICE_NOTICES, False),
     ),
-    SensorEntityDescription(
+    GreyhoundSensorEntityDescription(
         key="next_bin_collections",
         name="Bin Collections",
         icon="mdi:trash-can-outline",
@@ -58,33 +80,79 @@ ENTITY_DESCRIPTIONS = (
 )
 
 
+def next_bin_collections(events: Iterable[CollectionEvent]) -> dict[str, str]:
+    """Return the next collection date per friendly bin name."""
+    next_dates: dict[str, str] = {}
+    for event in events:  # already sorted by date
+        for bin_type in event.bins:
+            if BIN_DESCRIPTIONS[bin_type] not in next_dates:
+                next_dates[BIN_DESCRIPTIONS[bin_type]] = event.date.isoformat()
+    return next_dates
+
+
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    hass: HomeAssistant,
     entry: GreyhoundConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    async_add_entities(
-        GreyhoundBinSensor(
-            coordinator=entry.runtime_data.coordinator,
-            entity_description=entity_description,
-        )
-        for entity_description in ENTITY_DESCRIPTIONS
+    coordinator = entry.runtime_data.coordinator
+    entities: list[SensorEntity]
+    if entry.options.get(CONF_ENTITY_PROFILE) == ENTITY_PROFILE_COMPACT:
+        entities = [GreyhoundBinSummarySensor(coordinator)]
+    else:
+        entities = [
+            GreyhoundBinSensor(
+                coordinator=coordinator,
+                entity_description=entity_description,
+            )
+            for entity_description in ENTITY_DESCRIPTIONS
+            if entity_description.exists_fn(entry.options)
+        ]
+
+    # Switching profiles or options must not leave orphaned registry rows
+    async_remove_stale_entities(
+        hass, entry, Platform.SENSOR, {entity.unique_id for entity in entities}
     )
+    async_add_entities(entities)
+
+
+class GreyhoundBinDatedSensor(GreyhoundBinEntity, SensorEntity):
+    """Sensor whose state depends on today's date as well as the data."""
 
+    _attr_should_poll = False
 
-class GreyhoundBinSensor(GreyhoundBinEntity, SensorEntity):
+    async def async_added_to_hass(self) -> None:
+        """Also write the state at midnight, when the day counts change."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._async_midnight, hour=0, minute=0, second=0
+            )
+        )
+
+    @callback
+    def _async_midnight(self, now: datetime) -> None:
+        """Write the state for the new day."""
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:  # type: ignore
+        """Return True if entity data is available."""
+        return self.coordinator.last_update_success
+
+
+class GreyhoundBinSensor(GreyhoundBinDatedSensor):
     """Representation of a Greyhound bin collection sensor."""
 
     def __init__(
         self,
         coordinator: GreyhoundDataUpdateCoordinator,
-        entity_description: SensorEntityDescription,
+        entity_description: GreyhoundSensorEntityDescription,
     ) -> None:
         """Initialize the sensor class."""
         super().__init__(coordinator)
         self.entity_description = entity_description
-        self._attr_should_poll = False
         self._attr_unique_id = (
             f"{coordinator.config_entry.entry_id}_{entity_description.key}"
         )
@@ -97,12 +165,10 @@ class GreyhoundBinSensor(GreyhoundBinEntity, SensorEntity):
     @property
     def native_value(self) -> str | int | datetime.date | None:  # type: ignore Updated return type
         """Return the native value of the sensor."""
-        if not self.coordinator.data:
+        if (view := self.coordinator.current_view()) is None:
             return None
 
-        value = self.coordinator.data.get("sensors", {}).get(
-            self.entity_description.key
-        )
+        value = view[1].get(self.entity_description.key)
 
         if self.entity_description.key == "next_collection_date":
             if isinstance(value, str):
@@ -114,36 +180,65 @@ class GreyhoundBinSensor(GreyhoundBinEntity, SensorEntity):
 
         return value
 
-    @property
-    def available(self) -> bool:  # type: ignore
-        """Return True if entity data is available."""
-        return self.coordinator.last_update_success
-
     @property
     def extra_state_attributes(self):  # type: ignore
         """Return the next collection date per bin type."""
+        if (view := self.coordinator.current_view()) is None:
+            return None
+        events, sensors = view
 
         # Case 1: next_bin_collections → dictionary of bin type friendly names and dates
         if self.entity_description.key == "next_bin_collections":
-            events = self.coordinator.data.get("events", [])
-            next_dates = {}
-
-            for event in sorted(events, key=lambda e: e["date"]):
-                for bin_type in event.get("bins", []):
-                    if BIN_DESCRIPTIONS[bin_type] not in next_dates:
-                        next_dates[BIN_DESCRIPTIONS[bin_type]] = event[
-                            "date"
-                        ].isoformat()
+            return {"next_bin_collections": next_bin_collections(events)}
 
-            return {"next_bin_collections": next_dates}
+        # Case 2: service_disruption → every current notice
+        if self.entity_description.key == "service_disruption":
+            return {"notices": list(self.coordinator.data.get("notices", ()))}
 
-        # Case 2: bin_types → add bin_types_friendly attribute
+        # Case 3: bin_types → add bin_types_friendly attribute
         if self.entity_description.key == "bin_types":
-            return {
-                "bin_types_friendly": self.coordinator.data.get("sensors", {}).get(
-                    "bin_types_friendly"
-                )
-            }
+            return {"bin_types_friendly": sensors.get("bin_types_friendly")}
 
         # All other sensors → no extra attributes
         return None
+
+
+class GreyhoundBinSummarySensor(GreyhoundBinDatedSensor):
+    """Single sensor carrying every summary field of an account.
+
+    Used by the compact entity profile: one state write per refresh instead
+    of one per field.
+    """
+
+    _attr_device_class = SensorDeviceClass.DATE
+    _attr_icon = "mdi:delete-empty"
+    _attr_name = "Bin Collection Summary"
+    # The per-bin dates only change with the schedule, keep them out of history
+    _unrecorded_attributes = frozenset({"next_bin_collections"})
+
+    def __init__(self, coordinator: GreyhoundDataUpdateCoordinator) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_summary"
+
+    @property
+    def native_value(self) -> date | None:  # type: ignore
+        """Return the next collection date."""
+        if (view := self.coordinator.current_view()) is None:
+            return None
+        value = view[1].get("next_collection_date")
+        return date.fromisoformat(value) if value else None
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:  # type: ignore
+        """Return the remaining summary fields and the next date per bin."""
+        if (view := self.coordinator.current_view()) is None:
+            return None
+        events, sensors = view
+        attributes = {
+            key: value
+            for key, value in sensors.items()
+            if key != "next_collection_date"
+        }
+        attributes["next_bin_collections"] = next_bin_collections(events)
+        return attributes
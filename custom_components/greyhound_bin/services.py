@@ -0,0 +1,261 @@
+"""Services for greyhound_bin."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path, PurePath
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util.event_type import EventType
+import voluptuous as vol
+
+from .const import (
+    ATTR_ACCOUNTS,
+    ATTR_CONCURRENCY,
+    ATTR_ENTRY_ID,
+    ATTR_PATH,
+    ATTR_REFRESHES,
+    ATTR_SECONDS,
+    CONF_ACCNO,
+    CONF_PIN,
+    DOMAIN,
+    EVENT_PROFILE_FINISHED,
+    FLEET_CONCURRENCY,
+    IMPORT_DIRECTORY,
+    LOGGER,
+    PROFILE_DEFAULT_SECONDS,
+    PROFILE_MAX_SECONDS,
+    SERVICE_IMPORT_ACCOUNTS,
+    SERVICE_PROFILE,
+)
+from .data import ProfileFinishedData
+from .fleet import async_validate_credentials, read_credentials
+from .profiler import (
+    ProfilerBusyError,
+    summarize_profile,
+    summarize_snapshot,
+    write_results,
+)
+
+if TYPE_CHECKING:
+    from .data import GreyhoundConfigEntry
+
+PROFILE_FINISHED: EventType[ProfileFinishedData] = EventType(EVENT_PROFILE_FINISHED)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_REFRESHES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_SECONDS, default=PROFILE_DEFAULT_SECONDS): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=PROFILE_MAX_SECONDS)
+        ),
+    }
+)
+
+IMPORT_ACCOUNTS_SCHEMA = vol.Schema(
+    {
+        vol.Exclusive(ATTR_ACCOUNTS, "source"): [
+            vol.Schema(
+                {
+                    vol.Required(CONF_ACCNO): vol.All(cv.string, str.strip),
+                    vol.Required(CONF_PIN): vol.All(cv.string, str.strip),
+                }
+            )
+        ],
+        vol.Exclusive(ATTR_PATH, "source"): cv.string,
+        vol.Optional(ATTR_CONCURRENCY, default=FLEET_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+
+def _async_get_loaded_entries(
+    hass: HomeAssistant, entry_id: str | None = None
+) -> list[GreyhoundConfigEntry]:
+    """Return loaded config entries, optionally limited to one entry."""
+    entries = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED and entry_id in (None, entry.entry_id)
+    ]
+    if not entries:
+        raise ServiceValidationError(
+            f"No loaded Greyhound Bin entry found for {entry_id or DOMAIN}"
+        )
+    return entries
+
+
+async def _async_profile(call: ServiceCall) -> None:
+    """Arm a profiling session for refreshes that run on their own.
+
+    No refresh is triggered. The session ends after the requested number of
+    refreshes or when the time limit passes, whichever comes first, and the
+    results are written to the config dir and announced with an event.
+    """
+    hass = call.hass
+    profiler = hass.data[DOMAIN].profiler
+    entry_id = call.data.get(ATTR_ENTRY_ID)
+    _async_get_loaded_entries(hass, entry_id)
+
+    done = asyncio.Event()
+    try:
+        profiler.start(entry_id, call.data[ATTR_REFRESHES], done.set)
+    except ProfilerBusyError as err:
+        raise HomeAssistantError(str(err)) from err
+
+    hass.async_create_background_task(
+        _async_finish_profile(hass, done, call.data[ATTR_SECONDS]),
+        f"{DOMAIN} profile",
+    )
+
+
+async def _async_finish_profile(
+    hass: HomeAssistant, done: asyncio.Event, seconds: float
+) -> None:
+    """Wait for the armed session to end and write its results."""
+    started = time.monotonic()
+    try:
+        async with asyncio.timeout(seconds):
+            await done.wait()
+    except TimeoutError:
+        pass
+    finally:
+        session, snapshot = hass.data[DOMAIN].profiler.stop()
+
+    stamp = int(time.time())
+    profile_path = hass.config.path(f"{DOMAIN}_profile.{stamp}.cprof")
+    snapshot_path = hass.config.path(f"{DOMAIN}_allocations.{stamp}.tracemalloc")
+    await hass.async_add_executor_job(
+        write_results, session, snapshot, profile_path, snapshot_path
+    )
+    top_allocations = await hass.async_add_executor_job(summarize_snapshot, snapshot)
+    LOGGER.info("Wrote profile of %d refreshes to %s", session.refreshes, profile_path)
+
+    hass.bus.async_fire(
+        PROFILE_FINISHED,
+        {
+            "entry_id": session.entry_id,
+            "profile_file": profile_path,
+            "allocations_file": snapshot_path,
+            "refreshes": session.refreshes,
+            "duration": round(time.monotonic() - started, 3),
+            "top_functions": summarize_profile(session.profile),
+            "top_allocations": top_allocations,
+        },
+    )
+
+
+async def _async_read_accounts(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[tuple[str, str]]:
+    """Return the unique (account number, pin) pairs given to the import."""
+    if ATTR_ACCOUNTS in call.data:
+        return list(
+            {
+                account[CONF_ACCNO]: account[CONF_PIN]
+                for account in call.data[ATTR_ACCOUNTS]
+            }.items()
+        )
+    if ATTR_PATH not in call.data:
+        raise ServiceValidationError(
+            f"Either {ATTR_ACCOUNTS} or {ATTR_PATH} is required"
+        )
+
+    name = PurePath(call.data[ATTR_PATH])
+    if name.is_absolute():
+        # Anywhere else, the user has to allow the directory explicitly
+        path = Path(name)
+        if not hass.config.is_allowed_path(str(path)):
+            raise ServiceValidationError(f"Access to {path} is not allowed")
+    elif ".." in name.parts:
+        raise ServiceValidationError(f"{name} is outside {IMPORT_DIRECTORY}/")
+    else:
+        path = Path(hass.config.path(IMPORT_DIRECTORY, name))
+    try:
+        return await hass.async_add_executor_job(read_credentials, path)
+    except (OSError, ValueError, KeyError) as err:
+        raise ServiceValidationError(f"Could not read {path}: {err}") from err
+
+
+async def _async_import_accounts(call: ServiceCall) -> ServiceResponse:
+    """Validate many accounts concurrently and add the valid ones."""
+    hass = call.hass
+    started = time.monotonic()
+    credentials = await _async_read_accounts(hass, call)
+
+    configured = {
+        entry.unique_id for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    new = [(acc, pin) for acc, pin in credentials if acc not in configured]
+    login_jars = hass.data[DOMAIN].login_jars
+    errors = await async_validate_credentials(
+        new, call.data[ATTR_CONCURRENCY], login_jars
+    )
+    valid = [(acc, pin) for acc, pin in new if errors[acc] is None]
+
+    # Entries are set up as their flows finish, reusing the sessions logged in
+    # above; the first refresh slots in async_setup_entry stagger the portal load
+    results = await asyncio.gather(
+        *(
+            hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": SOURCE_IMPORT},
+                data={CONF_ACCNO: acc, CONF_PIN: pin},
+            )
+            for acc, pin in valid
+        )
+    )
+    imported = 0
+    for (acc, _), result in zip(valid, results):
+        if result["type"] is FlowResultType.CREATE_ENTRY:
+            imported += 1
+        else:
+            # Aborted, e.g. added meanwhile, no setup will take the session
+            login_jars.pop(acc, None)
+
+    response: ServiceResponse = {
+        "imported": imported,
+        "already_configured": len(credentials) - len(new) + len(valid) - imported,
+        "failed": len(new) - len(valid),
+        "errors": {acc: error for acc, error in errors.items() if error is not None},
+        "duration": round(time.monotonic() - started, 3),
+    }
+    LOGGER.info(
+        "Imported %d Greyhound accounts (%d already configured, %d failed) in %.1fs",
+        response["imported"],
+        response["already_configured"],
+        response["failed"],
+        response["duration"],
+    )
+    return response
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the greyhound_bin services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_ACCOUNTS,
+        _async_import_accounts,
+        schema=IMPORT_ACCOUNTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+    )
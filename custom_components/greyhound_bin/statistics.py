@@ -0,0 +1,224 @@
+"""Long-term statistics for collection history and refresh health."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timedelta
+import time
+from typing import TYPE_CHECKING
+from weakref import ref
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import BIN_DESCRIPTIONS, DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from .coordinator import GreyhoundDataUpdateCoordinator
+    from .schedule import CollectionEvent, Schedule
+
+
+def collection_rows(
+    events: Iterable[CollectionEvent],
+    bin_type: str,
+    after: date | None,
+    until: date,
+    start_sum: float,
+    start_of_day: Callable[[date], datetime],
+) -> list[StatisticData]:
+    """Return cumulative count rows for collections of one bin type.
+
+    Only days after the last imported one and up to until are returned, one
+    row per collection day, so the recorder's daily and monthly change of
+    the sum is the number of collections in that period.
+    """
+    rows: list[StatisticData] = []
+    total = start_sum
+    for event in events:
+        if event.date > until or (after is not None and event.date <= after):
+            continue
+        if bin_type in event.bins:
+            total += 1
+            rows.append(
+                StatisticData(start=start_of_day(event.date), state=1, sum=total)
+            )
+    return rows
+
+
+class GreyhoundStatistics:
+    """Import one account's collections and refresh health as statistics.
+
+    Collection days are imported in bulk the first time (backfilling the
+    whole schedule the portal returns) and then only as new days pass.
+    Refresh latencies are buffered and written once an hour together with
+    the data age, instead of as state rows on every refresh.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: GreyhoundDataUpdateCoordinator
+    ) -> None:
+        """Initialize the importer."""
+        entry = coordinator.config_entry
+        self._hass = hass
+        self._coordinator = coordinator
+        self._title = entry.title
+        self._prefix = f"{DOMAIN}:{slugify(entry.unique_id or entry.entry_id)}"
+        self._last_day: dict[str, date] = {}
+        self._sums: dict[str, float] = {}
+        # Identity check only, without keeping evicted data alive
+        self._schedule: ref[Schedule] | None = None
+        self._imported_until: date | None = None
+        self._last_attempt = coordinator.metrics.last_attempt
+        self._latencies: list[float] = []
+
+    def _collections_id(self, bin_type: str) -> str:
+        """Return the statistic id counting collections of a bin type."""
+        return f"{self._prefix}_{bin_type.lower()}_collections"
+
+    def _metadata(
+        self, statistic_id: str, name: str, unit: str | None, has_sum: bool
+    ) -> StatisticMetaData:
+        """Return the metadata of one of the account's statistics."""
+        return StatisticMetaData(
+            has_mean=not has_sum,
+            mean_type=(
+                StatisticMeanType.NONE if has_sum else StatisticMeanType.ARITHMETIC
+            ),
+            has_sum=has_sum,
+            name=f"{self._title} {name}",
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_of_measurement=unit,
+        )
+
+    async def async_start(self) -> CALLBACK_TYPE:
+        """Resume from the last imported rows and return a stop callback."""
+        recorder = get_instance(self._hass)
+        for bin_type in BIN_DESCRIPTIONS:
+            statistic_id = self._collections_id(bin_type)
+            last = await recorder.async_add_executor_job(
+                get_last_statistics, self._hass, 1, statistic_id, False, {"sum"}
+            )
+            if rows := last.get(statistic_id):
+                self._sums[bin_type] = rows[0].get("sum") or 0
+                self._last_day[bin_type] = dt_util.as_local(
+                    dt_util.utc_from_timestamp(rows[0]["start"])
+                ).date()
+
+        unsub_listener = self._coordinator.async_add_listener(self._async_update)
+        unsub_hourly = async_track_time_change(
+            self._hass, self._async_write_health, minute=0, second=0
+        )
+        self._async_update()
+
+        @callback
+        def _async_stop() -> None:
+            unsub_listener()
+            unsub_hourly()
+
+        return _async_stop
+
+    @callback
+    def _async_update(self) -> None:
+        """Buffer the refresh latency and import collection days that passed."""
+        metrics = self._coordinator.metrics
+        if metrics.last_attempt != self._last_attempt:
+            self._last_attempt = metrics.last_attempt
+            if metrics.last_duration is not None:
+                self._latencies.append(metrics.last_duration)
+
+        # Evicted, days that passed are imported once the schedule is back
+        if not (data := self._coordinator.data) or "schedule" not in data:
+            return
+        schedule = data["schedule"]
+        today = dt_util.now().date()
+        if (
+            self._schedule is not None
+            and schedule is self._schedule()
+            and today == self._imported_until
+        ):
+            return
+        self._schedule = ref(schedule)
+        self._imported_until = today
+
+        for bin_type, description in BIN_DESCRIPTIONS.items():
+            rows = collection_rows(
+                schedule.events,
+                bin_type,
+                self._last_day.get(bin_type),
+                today,
+                self._sums.get(bin_type, 0),
+                dt_util.start_of_local_day,
+            )
+            if not rows:
+                continue
+            self._sums[bin_type] = rows[-1]["sum"]
+            self._last_day[bin_type] = dt_util.as_local(rows[-1]["start"]).date()
+            LOGGER.debug(
+                "Importing %d %s collection days for %s",
+                len(rows),
+                bin_type,
+                self._prefix,
+            )
+            async_add_external_statistics(
+                self._hass,
+                self._metadata(
+                    self._collections_id(bin_type),
+                    f"{description} collections",
+                    None,
+                    has_sum=True,
+                ),
+                rows,
+            )
+
+    @callback
+    def _async_write_health(self, now: datetime) -> None:
+        """Write the past hour's refresh latency and the current data age."""
+        start = dt_util.as_utc(now).replace(
+            minute=0, second=0, microsecond=0
+        ) - timedelta(hours=1)
+
+        if self._latencies:
+            latencies, self._latencies = self._latencies, []
+            async_add_external_statistics(
+                self._hass,
+                self._metadata(
+                    f"{self._prefix}_refresh_latency",
+                    "refresh latency",
+                    UnitOfTime.SECONDS,
+                    has_sum=False,
+                ),
+                [
+                    StatisticData(
+                        start=start,
+                        mean=sum(latencies) / len(latencies),
+                        min=min(latencies),
+                        max=max(latencies),
+                    )
+                ],
+            )
+
+        if (last_success := self._coordinator.metrics.last_success) is not None:
+            age = time.time() - last_success
+            async_add_external_statistics(
+                self._hass,
+                self._metadata(
+                    f"{self._prefix}_data_age",
+                    "data age",
+                    UnitOfTime.SECONDS,
+                    has_sum=False,
+                ),
+                [StatisticData(start=start, mean=age, min=age, max=age)],
+            )
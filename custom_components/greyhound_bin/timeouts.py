@@ -0,0 +1,77 @@
+"""Adaptive request timeouts derived from observed portal latency."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import math
+import time
+
+from aiohttp import ClientTimeout
+from yarl import URL
+
+from .const import (
+    TIMEOUT_CEILING,
+    TIMEOUT_CONNECT,
+    TIMEOUT_DEFAULTS,
+    TIMEOUT_FLOOR,
+    TIMEOUT_MIN_SAMPLES,
+    TIMEOUT_MULTIPLIER,
+    TIMEOUT_PERCENTILE,
+    TIMEOUT_WINDOW,
+)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of unsorted samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class AdaptiveTimeouts:
+    """Per host and request type deadlines from a rolling latency window.
+
+    The read deadline is a multiple of the recent latency percentile, clamped
+    to a floor and ceiling. Timed out requests are recorded at the deadline
+    they hit, so a slow portal raises its own deadline on the next attempts.
+    Shared by every client of the integration, or of a fleet run.
+    """
+
+    def __init__(self, window: int = TIMEOUT_WINDOW) -> None:
+        """Initialize the timeouts."""
+        self._window = window
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+
+    def read_deadline(self, host: str, request: str) -> float:
+        """Return the read deadline for a request type on a host."""
+        samples = self._samples.get((host, request))
+        if samples is None or len(samples) < TIMEOUT_MIN_SAMPLES:
+            return TIMEOUT_DEFAULTS[request]
+        deadline = percentile(list(samples), TIMEOUT_PERCENTILE) * TIMEOUT_MULTIPLIER
+        return min(TIMEOUT_CEILING, max(TIMEOUT_FLOOR, deadline))
+
+    def observe(self, host: str, request: str, seconds: float) -> None:
+        """Record the latency of a finished request."""
+        samples = self._samples.get((host, request))
+        if samples is None:
+            samples = self._samples[(host, request)] = deque(maxlen=self._window)
+        samples.append(seconds)
+
+    @contextmanager
+    def measure(self, url: str, request: str) -> Iterator[ClientTimeout]:
+        """Yield the timeout for a request and record how long it took."""
+        host = URL(url).host or ""
+        read = self.read_deadline(host, request)
+        started = time.monotonic()
+        try:
+            yield ClientTimeout(
+                total=TIMEOUT_CONNECT + read,
+                sock_connect=TIMEOUT_CONNECT,
+                sock_read=read,
+            )
+        except TimeoutError:
+            self.observe(host, request, read)
+            raise
+        else:
+            self.observe(host, request, time.monotonic() - started)
@@ -0,0 +1,259 @@
+"""Per-refresh tracing spans written to a local trace log.
+
+Each sampled refresh becomes one trace, exported as one line of OTLP/JSON
+(the shape written by the OpenTelemetry collector's file exporter), so the
+log can be loaded into any OTLP-aware tool for offline analysis.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import random
+import secrets
+import threading
+import time
+from typing import Any
+
+from .const import DOMAIN, TRACE_BACKUP_COUNT, TRACE_MAX_BYTES
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    kind: int = SPAN_KIND_INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: int = STATUS_OK
+    status_message: str = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute on the span."""
+        self.attributes[key] = value
+
+
+class _NoopSpan:
+    """Stand-in returned outside a sampled trace."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Discard the attribute."""
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+@dataclass(slots=True)
+class _Trace:
+    """Spans collected for the trace that is being recorded."""
+
+    trace_id: str
+    spans: list[Span] = field(default_factory=list)
+
+
+_CURRENT: ContextVar[tuple[_Trace, Span] | None] = ContextVar(
+    f"{DOMAIN}_trace", default=None
+)
+
+
+def current_span() -> Span | _NoopSpan:
+    """Return the innermost active span, or a no-op span when not sampled."""
+    current = _CURRENT.get()
+    return current[1] if current else NOOP_SPAN
+
+
+@contextmanager
+def span(
+    name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any
+) -> Iterator[Span | _NoopSpan]:
+    """Record a child span of the current span, if a trace is being recorded.
+
+    Tasks copy the context when created, so spans opened in tasks spawned by
+    asyncio.gather are parented correctly.
+    """
+    current = _CURRENT.get()
+    if current is None:
+        yield NOOP_SPAN
+        return
+
+    trace, parent = current
+    child = Span(
+        name=name,
+        trace_id=trace.trace_id,
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id,
+        kind=kind,
+        attributes=attributes,
+    )
+    token = _CURRENT.set((trace, child))
+    try:
+        yield child
+    except BaseException as err:
+        _set_error(child, err)
+        raise
+    finally:
+        _CURRENT.reset(token)
+        child.end_ns = time.time_ns()
+        trace.spans.append(child)
+
+
+def _set_error(target: Span, err: BaseException) -> None:
+    """Mark a span as failed."""
+    target.status = STATUS_ERROR
+    target.status_message = str(err)
+    target.attributes["exception.type"] = type(err).__name__
+
+
+def _value(value: Any) -> dict[str, Any]:
+    """Return an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(item: Span) -> dict[str, Any]:
+    """Return a span in OTLP/JSON form."""
+    otlp: dict[str, Any] = {
+        "traceId": item.trace_id,
+        "spanId": item.span_id,
+        "name": item.name,
+        "kind": item.kind,
+        "startTimeUnixNano": str(item.start_ns),
+        "endTimeUnixNano": str(item.end_ns),
+        "attributes": [
+            {"key": key, "value": _value(value)}
+            for key, value in item.attributes.items()
+        ],
+        "status": {"code": item.status},
+    }
+    if item.parent_id:
+        otlp["parentSpanId"] = item.parent_id
+    if item.status_message:
+        otlp["status"]["message"] = item.status_message
+    return otlp
+
+
+def to_otlp(spans: list[Span]) -> dict[str, Any]:
+    """Return one trace as an OTLP/JSON export request."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": DOMAIN}}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": f"custom_components.{DOMAIN}"},
+                        "spans": [_otlp_span(item) for item in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class RefreshTracer:
+    """Start sampled refresh traces and hand finished ones to an exporter."""
+
+    def __init__(
+        self,
+        export: Callable[[dict[str, Any]], Any],
+        sample: Callable[[], float] = random.random,
+    ) -> None:
+        """Initialize the tracer."""
+        self._export = export
+        self._sample = sample
+
+    @contextmanager
+    def trace(
+        self, name: str, sample_rate: float, **attributes: Any
+    ) -> Iterator[Span | _NoopSpan]:
+        """Record the wrapped block as a root span if head sampling keeps it."""
+        if sample_rate <= 0 or self._sample() >= sample_rate:
+            yield NOOP_SPAN
+            return
+
+        trace = _Trace(trace_id=secrets.token_hex(16))
+        root = Span(
+            name=name,
+            trace_id=trace.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=None,
+            attributes=attributes,
+        )
+        token = _CURRENT.set((trace, root))
+        try:
+            yield root
+        except BaseException as err:
+            _set_error(root, err)
+            raise
+        finally:
+            _CURRENT.reset(token)
+            root.end_ns = time.time_ns()
+            self._export(to_otlp([root, *trace.spans]))
+
+
+class TraceLogWriter:
+    """Append traces to a size-bounded JSON Lines file with rotation.
+
+    Blocking, so call it from an executor. A lock keeps concurrent executor
+    jobs from interleaving writes and rotations.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = TRACE_MAX_BYTES,
+        backup_count: int = TRACE_BACKUP_COUNT,
+    ) -> None:
+        """Initialize the writer."""
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._lock = threading.Lock()
+
+    def write(self, trace: dict[str, Any]) -> None:
+        """Append one trace, rotating first if it would overflow the file."""
+        line = json.dumps(trace, separators=(",", ":")) + "\n"
+        with self._lock:
+            size = self._path.stat().st_size if self._path.exists() else 0
+            if size and size + len(line) > self._max_bytes:
+                self._rotate()
+            with self._path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+
+    def _rotate(self) -> None:
+        """Shift trace.jsonl to trace.jsonl.1 and so on, dropping the oldest."""
+        for index in range(self._backup_count, 0, -1):
+            source = (
+                self._path.with_name(f"{self._path.name}.{index - 1}")
+                if index > 1
+                else self._path
+            )
+            if source.exists():
+                source.replace(self._path.with_name(f"{self._path.name}.{index}"))
+        if self._backup_count == 0:
+            self._path.unlink(missing_ok=True)
@@ -0,0 +1,99 @@
+"""Websocket API pushing compact schedule updates to dashboards."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+import voluptuous as vol
+
+from .const import ATTR_ENTRY_ID, DOMAIN, SIGNAL_SCHEDULE_UPDATED, WS_SUBSCRIBE
+from .schedule import compact_events, schedule_delta
+
+if TYPE_CHECKING:
+    from .schedule import Schedule
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_SUBSCRIBE,
+        vol.Optional(ATTR_ENTRY_ID): str,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send each account's upcoming schedule once, then only what changes.
+
+    Collections are sent as [date, bins] pairs: a snapshot carries the whole
+    upcoming schedule, a delta the days to upsert (set) and to drop (remove).
+    Nothing runs for a subscription until a refresh brings a new schedule;
+    subscribing counts as a read of accounts that refresh lazily.
+    """
+    msg_id = msg["id"]
+    entry_id = msg.get(ATTR_ENTRY_ID)
+    sent: dict[str, Schedule] = {}
+
+    @callback
+    def _async_send(account: str, schedule: Schedule) -> None:
+        """Send a snapshot for a new account, otherwise a delta."""
+        today = dt_util.now().date()
+        previous = sent.get(account)
+        sent[account] = schedule
+        if previous is None:
+            connection.send_message(
+                websocket_api.event_message(
+                    msg_id,
+                    {
+                        ATTR_ENTRY_ID: account,
+                        "schedule": compact_events(schedule.between(today, date.max)),
+                    },
+                )
+            )
+            return
+
+        upserts, removed = schedule_delta(previous, schedule, today)
+        if upserts or removed:
+            connection.send_message(
+                websocket_api.event_message(
+                    msg_id,
+                    {
+                        ATTR_ENTRY_ID: account,
+                        "set": compact_events(upserts),
+                        "remove": [day.isoformat() for day in removed],
+                    },
+                )
+            )
+
+    @callback
+    def _async_schedule_updated(account: str, schedule: Schedule) -> None:
+        """Forward a refreshed schedule of a subscribed account."""
+        if entry_id in (None, account):
+            _async_send(account, schedule)
+
+    connection.subscriptions[msg_id] = async_dispatcher_connect(
+        hass, SIGNAL_SCHEDULE_UPDATED, _async_schedule_updated
+    )
+    connection.send_result(msg_id)
+
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if (
+            entry.state is ConfigEntryState.LOADED
+            and entry_id in (None, entry.entry_id)
+            and (data := entry.runtime_data.coordinator.async_touch())
+        ):
+            _async_send(entry.entry_id, data["schedule"])
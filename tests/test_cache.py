@@ -0,0 +1,207 @@
+"""Tests for the greyhound_bin data cache."""
+
+from datetime import date
+
+from custom_components.greyhound_bin.cache import (
+    EVICT_SIZE,
+    EVICT_TTL,
+    DataCache,
+    approximate_size,
+    encode_schedule,
+    summary_from_compact,
+    summary_to_compact,
+)
+from custom_components.greyhound_bin.schedule import Schedule, ScheduleCache
+
+COLLECTION_DAYS = {
+    "2025-01-07": [{"waste_types": ["BLACK"]}, {"waste_types": ["BROWN"]}],
+    "2025-01-14": [{"waste_types": ["GREEN"]}],
+    "2025-01-21": [{"waste_types": ["BLACK"]}, {"waste_types": ["BROWN"]}],
+}
+
+
+def _data(schedule: Schedule) -> dict:
+    events, summary = schedule.view(date(2025, 1, 6), 30)
+    return {
+        "events": events,
+        "sensors": {**summary, "service_disruption": "No disruptions"},
+        "schedule": schedule,
+        "notices": (),
+        "predicted": schedule.events[-1:],
+    }
+
+
+def _schedule() -> Schedule:
+    return Schedule.from_collection_days(COLLECTION_DAYS)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_summary_round_trip():
+    """Rebuilt summaries match the original and reuse interned events."""
+    data = _data(_schedule())
+
+    rebuilt = summary_from_compact(summary_to_compact(data))
+
+    assert rebuilt["events"] == data["events"]
+    assert rebuilt["events"][0] is data["events"][0]
+    assert rebuilt["predicted"] == data["predicted"]
+    assert rebuilt["sensors"] == data["sensors"]
+
+
+def test_approximate_size_skips_shared_events():
+    """Interned events are not counted, the containers holding them are."""
+    schedule = _schedule()
+
+    assert approximate_size(schedule.events) < approximate_size(
+        [event.date for event in schedule.events]
+    )
+    assert approximate_size(_data(schedule)) > approximate_size(schedule)
+
+
+def test_size_eviction_is_lru_and_rebuilds():
+    """Over budget, the least recently read entry is packed and rebuilt."""
+    clock = _Clock()
+    persisted = []
+    data = _data(_schedule())
+    probe = DataCache(max_bytes=10**6, ttl=60)
+    probe.put("a", data)
+    one = probe.bytes
+    probe.evict("a")
+    packed = probe.bytes
+    cache = DataCache(
+        max_bytes=2 * one + packed,
+        ttl=60,
+        persist=lambda: persisted.append(1),
+        clock=clock,
+    )
+
+    cache.put("a", data)
+    cache.put("b", _data(_schedule()))
+    assert cache.get("a") is not None
+    cache.put("c", _data(_schedule()))
+
+    assert cache.resident == 2
+    assert cache.evictions[EVICT_SIZE] == 1
+    assert cache.bytes <= cache.max_bytes
+    assert len(persisted) == 3
+    # Only the schedule is packed, and at its real size
+    assert cache.entry_bytes("b") == packed < one
+    assert packed - probe.entry_bytes("a") < len(encode_schedule(data["schedule"]))
+
+    summary = cache.peek("b")
+    assert "schedule" not in summary
+    assert summary["sensors"] == data["sensors"]
+    rebuilt = cache.get("b")
+    assert rebuilt["schedule"].events == data["schedule"].events
+    assert rebuilt["events"] is summary["events"]
+    assert cache.rebuilds == 1
+
+
+def test_shared_schedule_is_charged_once():
+    """Accounts with the same payload share one parsed or packed schedule."""
+    schedule = _schedule()
+    cache = DataCache(max_bytes=10**6, ttl=60)
+    cache.put("a", _data(schedule))
+    one = cache.bytes
+    for entry_id in "bcdefghij":
+        cache.put(entry_id, _data(schedule))
+
+    shared = cache.bytes
+    assert shared == 10 * one - 9 * approximate_size(schedule)
+
+    for entry_id in "abcdefghi":
+        cache.evict(entry_id)
+    # The schedule is still read by j, so nothing is packed
+    assert cache.rebuilds == 0 and cache.resident == 1
+    cache.evict("j")
+    assert cache.bytes < shared
+
+    cache.get("a")
+    assert cache.rebuilds == 1
+    assert cache.get("b")["schedule"] is cache.get("a")["schedule"]
+    assert cache.rebuilds == 1
+
+
+def test_peek_and_load_do_not_count_as_reads():
+    """Entity state reads neither keep an entry resident nor rebuild it."""
+    data = _data(_schedule())
+    probe = DataCache(max_bytes=10**6, ttl=60)
+    probe.put("a", data)
+    one = probe.bytes
+    probe.evict("a")
+    cache = DataCache(max_bytes=2 * one + probe.bytes, ttl=60)
+
+    cache.put("a", data)
+    cache.put("b", _data(_schedule()))
+    assert cache.peek("a")["schedule"] is data["schedule"]
+    cache.put("c", _data(_schedule()))
+
+    assert "schedule" not in cache.peek("a")
+    loaded = cache.load("a")
+    assert loaded["schedule"].events == data["schedule"].events
+    assert "schedule" not in cache.peek("a")
+    assert cache.rebuilds == 0
+    assert cache.peek("missing") is None
+
+
+def test_version_changes_only_with_new_data():
+    """Eviction and rebuilds keep an account's version, a new put changes it."""
+    cache = DataCache(max_bytes=10**6, ttl=60)
+    cache.put("a", _data(_schedule()))
+    version = cache.version("a")
+
+    cache.evict("a")
+    cache.get("a")
+    assert cache.version("a") == version
+    cache.put("a", _data(_schedule()))
+    assert cache.version("a") != version
+    assert cache.version("missing") is None
+
+
+def test_ttl_eviction_releases_parse_cache():
+    """Entries idle past the ttl drop their data and parsed schedule."""
+    clock = _Clock()
+    schedule_cache = ScheduleCache()
+    schedule = schedule_cache.get_or_parse("payload", lambda _: _schedule())
+    cache = DataCache(
+        max_bytes=10**6, ttl=60, schedule_cache=schedule_cache, clock=clock
+    )
+    cache.put("a", _data(schedule))
+
+    clock.now = 30
+    cache.evict_expired()
+    assert cache.resident == 1
+
+    clock.now = 100
+    cache.evict_expired()
+    assert cache.resident == 0
+    assert cache.evictions[EVICT_TTL] == 1
+    assert len(schedule_cache) == 0
+
+
+def test_snapshot_restore():
+    """A snapshot restores as evicted entries with their fetch time."""
+    cache = DataCache(max_bytes=10**6, ttl=60)
+    cache.put("a", _data(_schedule()), 1000.0)
+    cache.put("b", _data(_schedule()), 2000.0)
+    cache.evict("b")
+
+    restored = DataCache(max_bytes=10**6, ttl=60)
+    restored.restore(cache.snapshot())
+
+    assert restored.fetched("a") == 1000.0
+    assert restored.resident == 0
+    assert restored.peek("a")["sensors"] == cache.peek("a")["sensors"]
+    assert restored.get("a")["schedule"].events == cache.get("a")["schedule"].events
+    # Identical payloads are restored into one shared schedule
+    assert restored.get("b")["schedule"] is restored.get("a")["schedule"]
+    restored.remove("a")
+    restored.remove("b")
+    assert restored.bytes == 0
@@ -0,0 +1,168 @@
+"""Tests for the greyhound_bin coordinator."""
+
+import asyncio
+from datetime import timedelta
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.config_entries import current_entry
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.greyhound_bin.cache import DataCache
+from custom_components.greyhound_bin.const import (
+    CONF_LAZY_REFRESH,
+    DOMAIN,
+    LAZY_RETRY_MINUTES,
+    LOGGER,
+)
+from custom_components.greyhound_bin.coordinator import GreyhoundDataUpdateCoordinator
+from custom_components.greyhound_bin.schedule import Schedule
+
+
+def _coordinator(hass, lazy: bool = True) -> GreyhoundDataUpdateCoordinator:
+    entry = MockConfigEntry(
+        domain=DOMAIN, entry_id="abc", options={CONF_LAZY_REFRESH: lazy}
+    )
+    entry.add_to_hass(hass)
+    hass.data[DOMAIN] = SimpleNamespace(data_cache=DataCache(max_bytes=10**6, ttl=3600))
+    current_entry.set(entry)
+    return GreyhoundDataUpdateCoordinator(
+        hass=hass, logger=LOGGER, name=DOMAIN, update_interval=None
+    )
+
+
+def _schedule(*days: int) -> Schedule:
+    today = dt_util.now().date()
+    return Schedule.from_collection_days(
+        {
+            (today + timedelta(days=day)).isoformat(): [{"waste_types": ["BLACK"]}]
+            for day in days
+        }
+    )
+
+
+async def test_current_view_is_computed_when_read(hass):
+    """Day counts follow today's date, not the date of the last refresh."""
+    coordinator = _coordinator(hass)
+    coordinator.data = {
+        "events": (),
+        "sensors": {"days_until_collection": 5, "service_disruption": "None"},
+        "schedule": _schedule(-4, 1),
+        "notices": (),
+        "predicted": (),
+    }
+
+    events, sensors = coordinator.current_view()
+
+    assert len(events) == 1
+    assert sensors["days_until_collection"] == 1
+    assert sensors["collection_status"] == "Tomorrow"
+    assert sensors["service_disruption"] == "None"
+
+
+async def test_current_view_falls_back_to_predictions(hass):
+    """Predicted events stand in once the fetched schedule has run out."""
+    coordinator = _coordinator(hass)
+    coordinator.data = {
+        "events": (),
+        "sensors": {},
+        "schedule": _schedule(-7),
+        "notices": (),
+        "predicted": _schedule(3).events,
+    }
+
+    _, sensors = coordinator.current_view()
+
+    assert sensors["days_until_collection"] == 3
+    assert "service_disruption" not in sensors
+
+
+async def test_state_reads_do_not_rebuild_evicted_data(hass):
+    """Entity states use the resident summary, explicit reads rebuild."""
+    coordinator = _coordinator(hass, lazy=False)
+    data_cache = hass.data[DOMAIN].data_cache
+    schedule = _schedule(-4, 1, 8)
+    coordinator.data = {
+        "events": schedule.view(dt_util.now().date(), 30)[0],
+        "sensors": {},
+        "schedule": schedule,
+        "notices": (),
+        "predicted": (),
+    }
+    data_cache.evict("abc")
+
+    _, sensors = coordinator.current_view()
+    assert sensors["days_until_collection"] == 1
+    assert data_cache.rebuilds == 0
+    assert data_cache.resident == 0
+
+    assert coordinator.async_touch()["schedule"].events == schedule.events
+    assert data_cache.rebuilds == 1
+    assert "schedule" in coordinator.data
+
+
+async def test_touch_refreshes_only_stale_lazy_entries(hass):
+    """Fresh data, or an entry that polls, is never refreshed on read."""
+    coordinator = _coordinator(hass, lazy=False)
+    coordinator.metrics.last_success = time.time() - 86400 * 2
+    with patch.object(coordinator, "async_refresh", AsyncMock()) as refresh:
+        coordinator.async_touch()
+        await hass.async_block_till_done()
+    refresh.assert_not_awaited()
+
+    coordinator = _coordinator(hass)
+    coordinator.metrics.last_success = coordinator.metrics.last_attempt = (
+        time.time() - 3600
+    )
+    with patch.object(coordinator, "async_refresh", AsyncMock()) as refresh:
+        coordinator.async_touch()
+        await hass.async_block_till_done()
+        refresh.assert_not_awaited()
+
+        coordinator.metrics.last_success = coordinator.metrics.last_attempt = (
+            time.time() - 86400 * 2
+        )
+        coordinator.async_touch()
+        await hass.async_block_till_done()
+    refresh.assert_awaited_once()
+    assert coordinator.metrics.lazy_refreshes == 1
+
+
+async def test_touch_waits_after_a_failed_refresh(hass):
+    """A failed refresh is only retried after the retry wait."""
+    coordinator = _coordinator(hass)
+    coordinator.metrics.last_success = time.time() - 86400 * 2
+    coordinator.metrics.last_attempt = time.time() - 60
+    with patch.object(coordinator, "async_refresh", AsyncMock()) as refresh:
+        coordinator.async_touch()
+        await hass.async_block_till_done()
+        refresh.assert_not_awaited()
+
+        coordinator.metrics.last_attempt = time.time() - LAZY_RETRY_MINUTES * 60 - 1
+        coordinator.async_touch()
+        await hass.async_block_till_done()
+    refresh.assert_awaited_once()
+
+
+async def test_touch_runs_one_refresh_at_a_time(hass):
+    """Reads during a lazy refresh do not start another one."""
+    coordinator = _coordinator(hass)
+    release = asyncio.Event()
+    with patch.object(
+        coordinator, "async_refresh", AsyncMock(side_effect=release.wait)
+    ) as refresh:
+        coordinator.async_touch()
+        await asyncio.sleep(0)
+        coordinator.async_touch()
+        coordinator.async_touch()
+        release.set()
+        await hass.async_block_till_done()
+
+        assert refresh.await_count == 1
+        assert coordinator.metrics.lazy_refreshes == 1
+        # The guard is released once the refresh finishes
+        coordinator.async_touch()
+        await hass.async_block_till_done()
+    assert refresh.await_count == 2
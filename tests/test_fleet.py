@@ -0,0 +1,145 @@
+"""Tests for greyhound_bin fleet fetcher."""
+
+import asyncio
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+from aiohttp import web
+
+from custom_components.greyhound_bin import api
+from custom_components.greyhound_bin.fleet import (
+    JsonLinesSink,
+    SqliteSink,
+    async_validate_credentials,
+    read_credentials,
+)
+
+
+def test_read_credentials(tmp_path):
+    """CSV and JSON Lines credentials are read and de-duplicated."""
+    csv_file = tmp_path / "accounts.csv"
+    csv_file.write_text("account number,pin\n 1001 ,1111\n1002,2222\n1001,1111\n")
+    assert read_credentials(csv_file) == [("1001", "1111"), ("1002", "2222")]
+
+    jsonl_file = tmp_path / "accounts.jsonl"
+    jsonl_file.write_text(json.dumps({"account number": 1003, "pin": "3333"}) + "\n")
+    assert read_credentials(jsonl_file) == [("1003", "3333")]
+
+
+def test_sinks_resume(tmp_path):
+    """Only accounts whose latest record succeeded count as completed."""
+    records = [
+        {"account": "1", "status": "ok", "fetched_at": "x", "collection_days": []},
+        {"account": "2", "status": "ok", "fetched_at": "x", "collection_days": []},
+        {"account": "2", "status": "error", "fetched_at": "y", "error": "boom"},
+    ]
+    for sink_type, name in ((JsonLinesSink, "out.jsonl"), (SqliteSink, "out.db")):
+        sink = sink_type(tmp_path / name)
+        sink.open()
+        for record in records:
+            sink.write(record)
+        sink.close()
+        assert sink_type(tmp_path / name).completed() == {"1"}
+
+
+def test_jsonl_sink_resumes_after_truncated_line(tmp_path):
+    """A half written last line is skipped and the next record starts anew."""
+    path = tmp_path / "out.jsonl"
+    record = {"account": "1", "status": "ok", "fetched_at": "x", "collection_days": []}
+    path.write_text(json.dumps(record) + '\n{"account": "2", "sta')
+
+    sink = JsonLinesSink(path)
+    assert sink.completed() == {"1"}
+    sink.open()
+    sink.write({**record, "account": "3"})
+    assert JsonLinesSink(path).completed() == {"1", "3"}
+    sink.close()
+
+
+def test_runs_without_home_assistant():
+    """The command line entry point does not import Home Assistant."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "from custom_components.greyhound_bin import fleet\n"
+            "assert not any(m.startswith('homeassistant') for m in sys.modules)\n"
+            "fleet.main(['--help'])",
+        ],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "credentials" in result.stdout
+
+
+def test_validate_credentials_isolates_sessions(monkeypatch, socket_enabled):
+    """Concurrent logins never send another account's session cookie."""
+    shared = []
+    jars = {}
+    active = peak = 0
+
+    async def login_page(request: web.Request) -> web.Response:
+        return web.Response(
+            text='<input name="csrfmiddlewaretoken" value="abc">',
+            content_type="text/html",
+        )
+
+    async def login(request: web.Request) -> web.Response:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        form = await request.post()
+        if "sessionid" in request.cookies:
+            shared.append(form["customerNo"])
+        if form["pinCode"] == "bad":
+            return web.Response(text="<form></form>", content_type="text/html")
+        response = web.HTTPFound("/")
+        response.set_cookie("sessionid", form["customerNo"])
+        raise response
+
+    async def validate() -> dict[str, str | None]:
+        app = web.Application()
+        app.router.add_get("/", login_page)
+        app.router.add_post("/", login)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        # A host name, cookie jars ignore cookies set by an IP address
+        monkeypatch.setattr(api, "LOGIN_URL", f"http://localhost:{port}/")
+        try:
+            return await async_validate_credentials(
+                [
+                    (str(account), "bad" if account % 3 else "ok")
+                    for account in range(9)
+                ],
+                concurrency=4,
+                cookie_jars=jars,
+            )
+        finally:
+            await runner.cleanup()
+
+    errors = asyncio.run(validate())
+
+    assert [account for account, error in errors.items() if error is None] == [
+        "0",
+        "3",
+        "6",
+    ]
+    assert "GreyhoundAPIAuthError" in errors["1"]
+    assert shared == []
+    assert peak <= 4
+    # The valid accounts keep their own logged-in session
+    assert {
+        account: [cookie.value for cookie in jar if cookie.key == "sessionid"]
+        for account, jar in jars.items()
+    } == {"0": ["0"], "3": ["3"], "6": ["6"]}
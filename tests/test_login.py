@@ -0,0 +1,84 @@
+"""Tests for greyhound_bin login helpers."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.greyhound_bin.api import (
+    GreyhoundAPIAuthError,
+    GreyhoundApiClient,
+    GreyhoundAPIError,
+    extract_csrf_token,
+    login_succeeded,
+)
+
+
+class _LoginResponse:
+    """Answer to the login POST."""
+
+    def __init__(self, status: int, cookies: dict) -> None:
+        self.status = status
+        self.cookies = cookies
+        self.headers: dict = {}
+
+    async def __aenter__(self) -> "_LoginResponse":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return b"<form></form>"
+
+
+class _Session:
+    """Session with a csrftoken cookie whose login POST answers one way."""
+
+    def __init__(self, status: int, cookies: dict | None = None) -> None:
+        self.response = _LoginResponse(status, cookies or {})
+        self.cookie_jar = SimpleNamespace(
+            filter_cookies=lambda url: {"csrftoken": SimpleNamespace(value="abc")}
+        )
+
+    def post(self, *args, **kwargs) -> _LoginResponse:
+        return self.response
+
+
+def test_extract_csrf_token():
+    """The token is found whatever the attribute order."""
+    assert (
+        extract_csrf_token(
+            '<form><input type="hidden" name="csrfmiddlewaretoken" value="abc"></form>'
+        )
+        == "abc"
+    )
+    assert (
+        extract_csrf_token("<INPUT value='xyz' name='csrfmiddlewaretoken'/>") == "xyz"
+    )
+    assert extract_csrf_token('<input name="other" value="abc">') is None
+
+
+def test_login_succeeded():
+    """Any redirect or a new session cookie counts as a login."""
+    assert login_succeeded(302, False)
+    assert login_succeeded(303, True)
+    assert login_succeeded(200, True)
+    assert not login_succeeded(200, False)
+    assert not login_succeeded(403, False)
+
+
+def test_login_failure_types():
+    """A portal error is not reported as rejected credentials."""
+
+    async def login(session: _Session) -> None:
+        await GreyhoundApiClient("1", "2", session).login()
+
+    with pytest.raises(GreyhoundAPIError, match="503") as err:
+        asyncio.run(login(_Session(503)))
+    assert not isinstance(err.value, GreyhoundAPIAuthError)
+
+    with pytest.raises(GreyhoundAPIAuthError):
+        asyncio.run(login(_Session(200)))
+
+    asyncio.run(login(_Session(200, {"sessionid": "x"})))
@@ -0,0 +1,53 @@
+"""Tests for greyhound_bin OpenMetrics rendering."""
+
+from custom_components.greyhound_bin.cache import DataCache
+from custom_components.greyhound_bin.metrics import (
+    EntrySample,
+    LatencyHistogram,
+    RefreshMetrics,
+    render_openmetrics,
+)
+from custom_components.greyhound_bin.schedule import ScheduleCache
+
+
+def test_render_openmetrics():
+    """Counters, gauges and the latency histogram are rendered."""
+    metrics = RefreshMetrics()
+    metrics.observe(0.4)
+    metrics.observe(12.0, TimeoutError())
+    metrics.last_success = 1000.0
+    metrics.last_attempt = 1100.0
+    metrics.lazy_refreshes = 3
+    histogram = LatencyHistogram((0.5, 5.0))
+    histogram.observe(0.4)
+    histogram.observe(12.0)
+
+    text = render_openmetrics(
+        [EntrySample("abc", metrics, 2, 2048, 10800.0, 512)],
+        histogram,
+        ScheduleCache(),
+        DataCache(max_bytes=4096, ttl=3600),
+        1300.0,
+    )
+
+    lines = text.splitlines()
+    assert 'greyhound_bin_refreshes_total{entry_id="abc"} 2' in lines
+    assert (
+        'greyhound_bin_refresh_failures_total{entry_id="abc",error="TimeoutError"} 1'
+        in lines
+    )
+    assert 'greyhound_bin_logins_total{entry_id="abc"} 2' in lines
+    assert 'greyhound_bin_received_bytes_total{entry_id="abc"} 2048' in lines
+    assert 'greyhound_bin_data_age_seconds{entry_id="abc"} 300.000' in lines
+    assert (
+        'greyhound_bin_next_refresh_timestamp_seconds{entry_id="abc"} 11900.000'
+        in lines
+    )
+    assert 'greyhound_bin_lazy_refreshes_total{entry_id="abc"} 3' in lines
+    assert 'greyhound_bin_refresh_duration_seconds_bucket{le="0.5"} 1' in lines
+    assert 'greyhound_bin_refresh_duration_seconds_bucket{le="5.0"} 1' in lines
+    assert 'greyhound_bin_refresh_duration_seconds_bucket{le="+Inf"} 2' in lines
+    assert 'greyhound_bin_data_cache_entry_bytes{entry_id="abc"} 512' in lines
+    assert "greyhound_bin_data_cache_limit_bytes 4096" in lines
+    assert 'greyhound_bin_data_cache_evictions_total{reason="ttl"} 0' in lines
+    assert lines[-1] == "# EOF"
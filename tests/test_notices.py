@@ -0,0 +1,82 @@
+"""Tests for greyhound_bin service notices."""
+
+import asyncio
+
+from aiohttp import ClientSession, web
+import pytest
+
+from custom_components.greyhound_bin import api
+from custom_components.greyhound_bin.api import (
+    GreyhoundApiClient,
+    GreyhoundNoticesUnavailable,
+    parse_notices,
+    with_disruption,
+)
+from custom_components.greyhound_bin.const import NO_DISRUPTION
+
+NOTICES_PAGE = """
+<html><body>
+  <nav><a href="/">Home</a></nav>
+  <div class="alert alert-warning">
+    <strong>Storm Eowyn:</strong>
+    <p class="notice-body">Collections on Friday   are delayed by one day.</p>
+  </div>
+  <ul>
+    <li class="notification">Christmas schedule now available</li>
+    <li class="notification">Christmas schedule now available</li>
+  </ul>
+</body></html>
+"""
+
+
+def test_parse_notices_flattens_and_deduplicates():
+    """Nested notice markup yields one whitespace-normalised notice each."""
+    assert parse_notices(NOTICES_PAGE) == (
+        "Storm Eowyn: Collections on Friday are delayed by one day.",
+        "Christmas schedule now available",
+    )
+    assert parse_notices("<html><body><p>Nothing</p></body></html>") == ()
+
+
+def test_with_disruption():
+    """The sensor shows the first notice or a placeholder, once fetched."""
+    summary = {"bin_types": "GREEN"}
+
+    assert "service_disruption" not in with_disruption(summary, None)
+    assert with_disruption(summary, ())["service_disruption"] == NO_DISRUPTION
+    merged = with_disruption(summary, ("x" * 300, "second"))
+    assert merged["service_disruption"] == "x" * 255
+    assert merged["bin_types"] == "GREEN"
+
+
+def test_notices_page_must_be_served_in_place(monkeypatch, socket_enabled):
+    """A redirect, to the login form or elsewhere, is never parsed."""
+
+    async def notices(request: web.Request) -> web.Response:
+        return web.Response(text=NOTICES_PAGE, content_type="text/html")
+
+    async def moved(request: web.Request) -> web.Response:
+        raise web.HTTPFound("/notifications")
+
+    async def fetch(path: str) -> tuple[str, ...]:
+        app = web.Application()
+        app.router.add_get("/notifications", notices)
+        app.router.add_get("/moved", moved)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(api, "NOTICES_URL", f"http://127.0.0.1:{port}{path}")
+        try:
+            async with ClientSession() as session:
+                client = GreyhoundApiClient("1", "2", session, notices=True)
+                return await client._async_get_notices()
+        finally:
+            await runner.cleanup()
+
+    assert len(asyncio.run(fetch("/notifications"))) == 2
+    with pytest.raises(GreyhoundNoticesUnavailable, match="302"):
+        asyncio.run(fetch("/moved"))
+    with pytest.raises(GreyhoundNoticesUnavailable, match="404"):
+        asyncio.run(fetch("/missing"))
@@ -0,0 +1,58 @@
+"""Tests for greyhound_bin refresh profiler."""
+
+import pytest
+
+from custom_components.greyhound_bin.profiler import (
+    ProfilerBusyError,
+    RefreshProfiler,
+    summarize_profile,
+)
+
+
+def _work() -> int:
+    return sum(i * i for i in range(1000))
+
+
+def test_profiler_tracks_matching_entry():
+    """Only refreshes of the selected entry are profiled."""
+    profiler = RefreshProfiler()
+    profiler.start("entry_a")
+
+    with profiler.track("entry_b"):
+        _work()
+    with profiler.track("entry_a"):
+        _work()
+
+    session, snapshot = profiler.stop()
+    assert session.refreshes == 1
+    assert not profiler.active
+    assert any("_work" in row["function"] for row in summarize_profile(session.profile))
+    assert snapshot.statistics("lineno") is not None
+
+
+def test_profiler_calls_on_done_at_target():
+    """The session reports once the requested refreshes were tracked."""
+    done = []
+    profiler = RefreshProfiler()
+    profiler.start(target=2, on_done=lambda: done.append(True))
+
+    with profiler.track("entry_a"):
+        _work()
+    assert not done
+    with profiler.track("entry_b"):
+        _work()
+    assert done == [True]
+
+    session, _ = profiler.stop()
+    assert session.refreshes == 2
+
+
+def test_profiler_single_session():
+    """A second session cannot start while one is running."""
+    profiler = RefreshProfiler()
+    profiler.start()
+    with pytest.raises(ProfilerBusyError):
+        profiler.start()
+    profiler.stop()
+    with pytest.raises(ProfilerBusyError):
+        profiler.stop()
@@ -0,0 +1,75 @@
+"""Tests for greyhound_bin recurrence inference."""
+
+from datetime import date, timedelta
+
+from custom_components.greyhound_bin.recurrence import (
+    infer_recurrence,
+    prediction_error,
+)
+from custom_components.greyhound_bin.schedule import Schedule
+
+GREEN = [{"waste_types": ["GREEN"]}]
+BLACK_BROWN = [{"waste_types": ["BLACK"]}, {"waste_types": ["BROWN"]}]
+
+
+def _alternating(start: date, weeks: int, shifted: dict[int, int] | None = None):
+    days = {}
+    for week in range(weeks):
+        day = start + timedelta(weeks=week, days=(shifted or {}).get(week, 0))
+        days[day.isoformat()] = GREEN if week % 2 else BLACK_BROWN
+    return Schedule.from_collection_days(days)
+
+
+def test_infer_alternating_weekly():
+    """A weekly green / brown-and-black alternation is learnt and extended."""
+    schedule = _alternating(date(2025, 1, 6), 6)
+    recurrence = infer_recurrence(schedule)
+
+    assert recurrence is not None
+    assert recurrence.period_days == 7
+    assert recurrence.weekday == 0
+    assert recurrence.anchor == date(2025, 2, 10)
+    predicted = recurrence.extend(schedule, date(2025, 3, 3))
+    assert [(event.date, event.bins) for event in predicted] == [
+        (date(2025, 2, 17), ("BLACK", "BROWN")),
+        (date(2025, 2, 24), ("GREEN",)),
+        (date(2025, 3, 3), ("BLACK", "BROWN")),
+    ]
+
+
+def test_infer_tolerates_holiday_shift():
+    """A single shifted collection does not move the anchor."""
+    schedule = _alternating(date(2025, 1, 6), 8, shifted={7: 1})
+    recurrence = infer_recurrence(schedule)
+
+    assert recurrence is not None
+    assert recurrence.anchor == date(2025, 2, 17)
+    assert recurrence.cycle == (("BLACK", "BROWN"), ("GREEN",))
+
+
+def test_infer_rejects_irregular():
+    """Too few or irregular collections are not extrapolated."""
+    assert infer_recurrence(_alternating(date(2025, 1, 6), 3)) is None
+    irregular = Schedule.from_collection_days(
+        {
+            "2025-01-01": GREEN,
+            "2025-01-03": GREEN,
+            "2025-01-10": GREEN,
+            "2025-01-12": GREEN,
+            "2025-01-30": GREEN,
+        }
+    )
+    assert infer_recurrence(irregular) is None
+
+
+def test_prediction_error():
+    """Only newly revealed dates are checked against the prediction."""
+    previous = _alternating(date(2025, 1, 6), 6)
+    recurrence = infer_recurrence(previous)
+
+    assert (
+        prediction_error(recurrence, previous, _alternating(date(2025, 1, 6), 8)) == 0
+    )
+    assert prediction_error(recurrence, previous, previous) is None
+    moved = _alternating(date(2025, 1, 6), 8, shifted={7: 1})
+    assert prediction_error(recurrence, previous, moved) == 2
@@ -0,0 +1,47 @@
+"""Tests for greyhound_bin collection reminders."""
+
+from datetime import date, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.greyhound_bin.reminders import build_reminders
+from custom_components.greyhound_bin.schedule import Schedule
+
+SCHEDULE = Schedule.from_collection_days(
+    {
+        "2025-01-07": [{"waste_types": ["BLACK"]}, {"waste_types": ["BROWN"]}],
+        "2025-01-14": [{"waste_types": ["GREEN"]}],
+    }
+)
+
+
+def test_build_reminders():
+    """Bins sharing an offset are grouped and past reminders are dropped."""
+    now = dt_util.as_utc(dt_util.start_of_local_day(date(2025, 1, 6)))
+    reminders = build_reminders(
+        "entry", SCHEDULE, {"BLACK": 6, "BROWN": 6, "GREEN": 30}, now
+    )
+
+    assert [data for _, data in reminders] == [
+        {
+            "entry_id": "entry",
+            "date": "2025-01-07",
+            "bins": ["BLACK", "BROWN"],
+            "offset_hours": 6,
+        },
+        {
+            "entry_id": "entry",
+            "date": "2025-01-14",
+            "bins": ["GREEN"],
+            "offset_hours": 30,
+        },
+    ]
+    assert reminders[0][0] == dt_util.as_utc(
+        dt_util.start_of_local_day(date(2025, 1, 7)) - timedelta(hours=6)
+    )
+
+    later = now + timedelta(days=1)
+    assert [
+        data["date"]
+        for _, data in build_reminders("entry", SCHEDULE, {"BLACK": 6}, later)
+    ] == []
@@ -0,0 +1,154 @@
+"""Tests for greyhound_bin schedule parsing and caching."""
+
+from datetime import date
+
+from custom_components.greyhound_bin.schedule import (
+    MergedSchedule,
+    Schedule,
+    ScheduleCache,
+    compact_events,
+    diff_schedules,
+    schedule_delta,
+)
+
+COLLECTION_DAYS = {
+    "2025-01-14": [{"waste_types": ["GREEN"]}],
+    "2025-01-07": [{"waste_types": ["BLACK"]}, {"waste_types": ["BROWN"]}],
+    "not-a-date": [{"waste_types": ["GREEN"]}],
+    "2025-03-01": [{"waste_types": ["GREEN"]}],
+}
+
+
+def test_schedule_parses_sorted_and_interned():
+    """Events are sorted by date and bin tuples are shared."""
+    first = Schedule.from_collection_days(COLLECTION_DAYS)
+    second = Schedule.from_collection_days(dict(COLLECTION_DAYS))
+
+    assert [event.date for event in first.events] == [
+        date(2025, 1, 7),
+        date(2025, 1, 14),
+        date(2025, 3, 1),
+    ]
+    assert first.events[0].bins == ("BLACK", "BROWN")
+    assert first.events[1].bins is first.events[2].bins
+    assert first.events[0] is second.events[0]
+
+
+def test_schedule_view():
+    """The view filters to the horizon and builds the summary."""
+    schedule = Schedule.from_collection_days(COLLECTION_DAYS)
+
+    events, summary = schedule.view(date(2025, 1, 8), 30)
+    assert [event.date for event in events] == [date(2025, 1, 14)]
+    assert summary["next_collection_date"] == "2025-01-14"
+    assert summary["bin_types_friendly"] == "Recycle waste"
+    assert summary["collection_status"] == "In 6 days"
+    assert schedule.view(date(2025, 1, 8), 30) is schedule.view(date(2025, 1, 8), 30)
+
+    events, summary = schedule.view(date(2025, 1, 7), 0)
+    assert summary["bin_types"] == "BLACK, BROWN"
+    assert summary["collection_status"] == "Today"
+
+
+def test_schedule_cache_lru():
+    """Identical payloads are parsed once and the cache stays bounded."""
+    parsed = []
+
+    def parse(payload):
+        parsed.append(payload)
+        return Schedule(())
+
+    cache = ScheduleCache(max_size=2)
+    first = cache.get_or_parse("a", parse)
+    assert cache.get_or_parse("a", parse) is first
+    cache.get_or_parse("b", parse)
+    cache.get_or_parse("c", parse)
+
+    assert parsed == ["a", "b", "c"]
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_diff_schedules():
+    """Moved, removed and changed days inside the shared range are reported."""
+    old = Schedule.from_collection_days(
+        {
+            "2025-01-01": [{"waste_types": ["GREEN"]}],
+            "2025-01-08": [{"waste_types": ["BLACK"]}],
+            "2025-01-15": [{"waste_types": ["GREEN"]}],
+            "2025-01-22": [{"waste_types": ["BLACK"]}],
+        }
+    )
+    new = Schedule.from_collection_days(
+        {
+            "2025-01-08": [{"waste_types": ["BLACK"]}],
+            "2025-01-16": [{"waste_types": ["GREEN"]}],
+            "2025-01-22": [{"waste_types": ["BROWN"]}],
+            "2025-01-29": [{"waste_types": ["GREEN"]}],
+        }
+    )
+
+    diff = diff_schedules(old, new, date(2025, 1, 2))
+    assert [event.date for event in diff.added] == [date(2025, 1, 16)]
+    assert [event.date for event in diff.removed] == [date(2025, 1, 15)]
+    assert [(a.bins, b.bins) for a, b in diff.changed] == [(("BLACK",), ("BROWN",))]
+    assert not diff_schedules(old, old, date(2025, 1, 2))
+
+
+def test_schedule_delta_rebuilds_new_schedule():
+    """Applying the delta to the old upcoming days yields the new ones."""
+    old = Schedule.from_collection_days(COLLECTION_DAYS)
+    new = Schedule.from_collection_days(
+        {
+            "2025-01-07": [{"waste_types": ["BLACK"]}, {"waste_types": ["BROWN"]}],
+            "2025-01-15": [{"waste_types": ["GREEN"]}],
+            "2025-03-01": [{"waste_types": ["BLACK"]}],
+            "2025-03-08": [{"waste_types": ["GREEN"]}],
+        }
+    )
+
+    upserts, removed = schedule_delta(old, new, date(2025, 1, 8))
+
+    assert compact_events(upserts) == [
+        ["2025-01-15", ["GREEN"]],
+        ["2025-03-01", ["BLACK"]],
+        ["2025-03-08", ["GREEN"]],
+    ]
+    assert removed == (date(2025, 1, 14),)
+
+    days = {event.date: event.bins for event in old.between(date(2025, 1, 8), date.max)}
+    for day in removed:
+        del days[day]
+    days.update((event.date, event.bins) for event in upserts)
+    assert days == {
+        event.date: event.bins for event in new.between(date(2025, 1, 8), date.max)
+    }
+    assert schedule_delta(new, new, date(2025, 1, 8)) == ((), ())
+
+
+def test_merged_schedule_labels_and_orders_accounts():
+    """Accounts' streams are merged by date and keep their labels."""
+    first = Schedule.from_collection_days(COLLECTION_DAYS)
+    second = Schedule.from_collection_days({"2025-01-10": [{"waste_types": ["GREEN"]}]})
+    merged = MergedSchedule(
+        [
+            ("A", first.events, False),
+            ("B", second.events, False),
+            ("B", second.between(date(2025, 1, 11), date.max), True),
+        ]
+    )
+
+    assert [(item.event.date.day, item.account) for item in merged.events] == [
+        (7, "A"),
+        (10, "B"),
+        (14, "A"),
+        (1, "A"),
+    ]
+    assert [
+        item.account for item in merged.between(date(2025, 1, 8), date(2025, 1, 14))
+    ] == [
+        "B",
+        "A",
+    ]
+    assert merged.next_from(date(2025, 1, 15)).event.date == date(2025, 3, 1)
+    assert merged.next_from(date(2025, 3, 2)) is None
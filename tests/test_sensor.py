@@ -0,0 +1,101 @@
+"""Tests for greyhound_bin sensor entities."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from homeassistant.const import Platform
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.greyhound_bin.const import (
+    CONF_ENTITY_PROFILE,
+    CONF_SERVICE_NOTICES,
+    DOMAIN,
+    ENTITY_PROFILE_COMPACT,
+    ENTITY_PROFILE_FULL,
+)
+from custom_components.greyhound_bin.sensor import (
+    GreyhoundBinSensor,
+    GreyhoundBinSummarySensor,
+    async_setup_entry,
+)
+
+SENSORS = {
+    "next_collection_date": "2025-01-07",
+    "bin_types": "BLACK, BROWN",
+    "bin_types_friendly": "General waste, Organic waste",
+    "days_until_collection": 1,
+    "collection_status": "Tomorrow",
+}
+
+
+def _entry(
+    hass, profile: str, sensors: dict, entry_id: str = "abc", notices: bool = False
+) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id=entry_id,
+        options={CONF_ENTITY_PROFILE: profile, CONF_SERVICE_NOTICES: notices},
+    )
+    entry.add_to_hass(hass)
+    coordinator = MagicMock(data={"sensors": sensors, "events": ()})
+    coordinator.config_entry = entry
+    entry.runtime_data = SimpleNamespace(coordinator=coordinator)
+    return entry
+
+
+async def _async_setup(hass, entry: MockConfigEntry) -> list:
+    added: list = []
+    await async_setup_entry(hass, entry, added.extend)
+    return added
+
+
+async def test_compact_profile_creates_summary_only(hass):
+    """The compact profile replaces every per-field sensor."""
+    entities = await _async_setup(hass, _entry(hass, ENTITY_PROFILE_COMPACT, SENSORS))
+
+    assert [type(entity) for entity in entities] == [GreyhoundBinSummarySensor]
+    assert entities[0].unique_id == "abc_summary"
+
+
+async def test_full_profile_skips_sensors_without_data(hass):
+    """Sensors the entry's options never fill are not created."""
+    entities = await _async_setup(hass, _entry(hass, ENTITY_PROFILE_FULL, SENSORS))
+    keys = {entity.entity_description.key for entity in entities}
+
+    assert all(isinstance(entity, GreyhoundBinSensor) for entity in entities)
+    assert "service_disruption" not in keys
+    assert "next_collection_date" in keys
+
+    # Notices not fetched yet, e.g. the first fetch failed
+    entry = _entry(hass, ENTITY_PROFILE_FULL, SENSORS, entry_id="def", notices=True)
+    registry = er.async_get(hass)
+    disruption = registry.async_get_or_create(
+        Platform.SENSOR, DOMAIN, "def_service_disruption", config_entry=entry
+    )
+    entities = await _async_setup(hass, entry)
+    assert "service_disruption" in {
+        entity.entity_description.key for entity in entities
+    }
+    assert registry.async_get(disruption.entity_id) is not None
+
+
+async def test_profile_change_removes_stale_entities(hass):
+    """Registry rows of sensors the new profile drops are removed."""
+    entry = _entry(hass, ENTITY_PROFILE_COMPACT, SENSORS)
+    registry = er.async_get(hass)
+    stale = registry.async_get_or_create(
+        Platform.SENSOR, DOMAIN, "abc_bin_types", config_entry=entry
+    )
+    kept = registry.async_get_or_create(
+        Platform.SENSOR, DOMAIN, "abc_summary", config_entry=entry
+    )
+    calendar = registry.async_get_or_create(
+        Platform.CALENDAR, DOMAIN, "abc_calendar", config_entry=entry
+    )
+
+    await _async_setup(hass, entry)
+
+    assert registry.async_get(stale.entity_id) is None
+    assert registry.async_get(kept.entity_id) is not None
+    assert registry.async_get(calendar.entity_id) is not None
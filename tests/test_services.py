@@ -0,0 +1,80 @@
+"""Tests for greyhound_bin services."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from homeassistant.exceptions import ServiceValidationError
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.greyhound_bin.const import (
+    ATTR_ACCOUNTS,
+    ATTR_PATH,
+    CONF_ACCNO,
+    CONF_PIN,
+    DOMAIN,
+    FLEET_CONCURRENCY,
+    SERVICE_IMPORT_ACCOUNTS,
+)
+from custom_components.greyhound_bin.services import async_setup_services
+
+
+async def test_import_accounts(hass, enable_custom_integrations):
+    """Only new accounts are validated and only valid ones are added."""
+    MockConfigEntry(
+        domain=DOMAIN, unique_id="1001", data={CONF_ACCNO: "1001", CONF_PIN: "1"}
+    ).add_to_hass(hass)
+    login_jars = {}
+    hass.data[DOMAIN] = SimpleNamespace(login_jars=login_jars)
+    async_setup_services(hass)
+
+    with patch(
+        "custom_components.greyhound_bin.services.async_validate_credentials",
+        return_value={"1002": None, "1003": "GreyhoundAPIAuthError: Login failed"},
+    ) as validate, patch(
+        "custom_components.greyhound_bin.async_setup", return_value=True
+    ), patch(
+        "custom_components.greyhound_bin.async_setup_entry", return_value=True
+    ):
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_ACCOUNTS,
+            {
+                ATTR_ACCOUNTS: [
+                    {CONF_ACCNO: "1001", CONF_PIN: "1"},
+                    {CONF_ACCNO: "1002", CONF_PIN: "2"},
+                    {CONF_ACCNO: "1002", CONF_PIN: "2"},
+                    {CONF_ACCNO: "1003", CONF_PIN: "3"},
+                ]
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    validate.assert_awaited_once_with(
+        [("1002", "2"), ("1003", "3")], FLEET_CONCURRENCY, login_jars
+    )
+    assert response["imported"] == 1
+    assert response["already_configured"] == 1
+    assert response["failed"] == 1
+    assert response["errors"] == {"1003": "GreyhoundAPIAuthError: Login failed"}
+    assert {entry.unique_id for entry in hass.config_entries.async_entries(DOMAIN)} == {
+        "1001",
+        "1002",
+    }
+
+
+@pytest.mark.parametrize("path", ["../secrets.yaml", "/etc/passwd"])
+async def test_import_accounts_path_outside_import_directory(hass, path):
+    """Files are read from the import folder or an allowlisted directory."""
+    hass.data[DOMAIN] = SimpleNamespace(login_jars={})
+    async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_ACCOUNTS,
+            {ATTR_PATH: path},
+            blocking=True,
+            return_response=True,
+        )
@@ -0,0 +1,37 @@
+"""Tests for greyhound_bin long-term statistics."""
+
+from datetime import UTC, date, datetime, time
+
+from custom_components.greyhound_bin.schedule import Schedule
+from custom_components.greyhound_bin.statistics import collection_rows
+
+SCHEDULE = Schedule.from_collection_days(
+    {
+        "2025-01-07": [{"waste_types": ["BLACK"]}, {"waste_types": ["BROWN"]}],
+        "2025-01-14": [{"waste_types": ["GREEN"]}],
+        "2025-01-21": [{"waste_types": ["BLACK"]}, {"waste_types": ["BROWN"]}],
+        "2025-01-28": [{"waste_types": ["GREEN"]}],
+    }
+)
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, UTC)
+
+
+def test_collection_rows_backfill_and_resume():
+    """The first import backfills past days, later ones continue the sum."""
+    rows = collection_rows(
+        SCHEDULE.events, "BLACK", None, date(2025, 1, 25), 0, _midnight
+    )
+    assert rows == [
+        {"start": _midnight(date(2025, 1, 7)), "state": 1, "sum": 1},
+        {"start": _midnight(date(2025, 1, 21)), "state": 1, "sum": 2},
+    ]
+
+    assert collection_rows(
+        SCHEDULE.events, "GREEN", date(2025, 1, 14), date(2025, 1, 28), 5, _midnight
+    ) == [{"start": _midnight(date(2025, 1, 28)), "state": 1, "sum": 6}]
+    assert not collection_rows(
+        SCHEDULE.events, "GREEN", date(2025, 1, 28), date(2025, 2, 1), 6, _midnight
+    )
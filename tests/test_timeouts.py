@@ -0,0 +1,62 @@
+"""Tests for greyhound_bin adaptive timeouts."""
+
+import pytest
+
+from custom_components.greyhound_bin.const import (
+    REQUEST_CALENDAR,
+    REQUEST_LOGIN_POST,
+    REQUEST_NOTICES,
+    TIMEOUT_CEILING,
+    TIMEOUT_CONNECT,
+    TIMEOUT_DEFAULTS,
+    TIMEOUT_FLOOR,
+)
+from custom_components.greyhound_bin.timeouts import AdaptiveTimeouts, percentile
+
+HOST = "app.greyhound.ie"
+
+
+def test_percentile_nearest_rank():
+    """The nearest-rank percentile picks an observed sample."""
+    samples = [float(value) for value in range(1, 21)]
+    assert percentile(samples, 0.95) == 19.0
+    assert percentile([3.0], 0.95) == 3.0
+
+
+def test_deadlines_follow_latency_per_request_type():
+    """Each request type adapts on its own and stays within the bounds."""
+    timeouts = AdaptiveTimeouts()
+    assert timeouts.read_deadline(HOST, REQUEST_NOTICES) == (
+        TIMEOUT_DEFAULTS[REQUEST_NOTICES]
+    )
+
+    for _ in range(10):
+        timeouts.observe(HOST, REQUEST_CALENDAR, 1.5)
+        timeouts.observe(HOST, REQUEST_LOGIN_POST, 0.1)
+        timeouts.observe("other.host", REQUEST_CALENDAR, 60.0)
+
+    assert timeouts.read_deadline(HOST, REQUEST_CALENDAR) == 3.0
+    assert timeouts.read_deadline(HOST, REQUEST_LOGIN_POST) == TIMEOUT_FLOOR
+    assert timeouts.read_deadline("other.host", REQUEST_CALENDAR) == TIMEOUT_CEILING
+
+
+def test_measure_records_timeouts_at_the_deadline():
+    """A timed out request raises the deadline, other failures are ignored."""
+    timeouts = AdaptiveTimeouts()
+    url = f"https://{HOST}/collection/collection_calendar"
+    for _ in range(5):
+        timeouts.observe(HOST, REQUEST_CALENDAR, 2.0)
+
+    with timeouts.measure(url, REQUEST_CALENDAR) as timeout:
+        assert timeout.sock_read == 4.0
+        assert timeout.sock_connect == TIMEOUT_CONNECT
+        assert timeout.total == TIMEOUT_CONNECT + 4.0
+
+    with pytest.raises(ValueError):
+        with timeouts.measure(url, REQUEST_CALENDAR):
+            raise ValueError
+    with pytest.raises(TimeoutError):
+        with timeouts.measure(url, REQUEST_CALENDAR):
+            raise TimeoutError
+
+    assert timeouts.read_deadline(HOST, REQUEST_CALENDAR) == 8.0
@@ -0,0 +1,76 @@
+"""Tests for greyhound_bin refresh tracing."""
+
+import asyncio
+import json
+
+import pytest
+
+from custom_components.greyhound_bin.tracing import (
+    STATUS_ERROR,
+    RefreshTracer,
+    TraceLogWriter,
+    span,
+)
+
+
+def _spans(trace):
+    return trace["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+
+def test_trace_parents_spans_across_tasks():
+    """Spans opened in gathered tasks share the root's trace."""
+    exported = []
+    tracer = RefreshTracer(exported.append, sample=lambda: 0.0)
+
+    async def fetch(name):
+        with span(name) as child:
+            child.set_attribute("bytes", 10)
+            await asyncio.sleep(0)
+
+    async def refresh():
+        with tracer.trace("refresh", 1.0, entry_id="abc"):
+            await asyncio.gather(fetch("calendar.get"), fetch("notices.get"))
+
+    asyncio.run(refresh())
+
+    spans = _spans(exported[0])
+    root = spans[0]
+    assert root["name"] == "refresh"
+    assert "parentSpanId" not in root
+    assert {item["name"] for item in spans[1:]} == {"calendar.get", "notices.get"}
+    for item in spans[1:]:
+        assert item["traceId"] == root["traceId"]
+        assert item["parentSpanId"] == root["spanId"]
+        assert item["attributes"] == [{"key": "bytes", "value": {"intValue": "10"}}]
+
+
+def test_trace_head_sampling_and_errors():
+    """Unsampled refreshes export nothing, failures mark the spans."""
+    exported = []
+    with RefreshTracer(exported.append, sample=lambda: 0.5).trace("r", 0.25):
+        with span("child") as child:
+            child.set_attribute("ignored", True)
+    assert not exported
+
+    tracer = RefreshTracer(exported.append, sample=lambda: 0.1)
+    with pytest.raises(ValueError):
+        with tracer.trace("r", 0.25):
+            with span("login.post"):
+                raise ValueError("boom")
+
+    root, child = _spans(exported[0])
+    assert child["status"] == {"code": STATUS_ERROR, "message": "boom"}
+    assert root["status"]["code"] == STATUS_ERROR
+
+
+def test_trace_log_rotates(tmp_path):
+    """The log is rotated before it would outgrow the size bound."""
+    path = tmp_path / "traces.jsonl"
+    writer = TraceLogWriter(path, max_bytes=100, backup_count=2)
+    for index in range(5):
+        writer.write({"n": index, "pad": "x" * 40})
+
+    assert json.loads(path.read_text())["n"] == 4
+    assert json.loads((tmp_path / "traces.jsonl.1").read_text())["n"] == 3
+    assert json.loads((tmp_path / "traces.jsonl.2").read_text())["n"] == 2
+    assert not (tmp_path / "traces.jsonl.3").exists()